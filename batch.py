@@ -0,0 +1,125 @@
+# batch.py
+# Mode batch tanpa UI: cluster + rekomendasi jurusan untuk satu file CSV siswa.
+#   python batch.py data/students.csv hasil.csv --chunksize 20000 --workers 4
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from models.kmeans_model import TRAIN_PATH, load_or_fit_model, predict_clusters
+from models.recommender import rank_majors
+from utils.data_processor import encode_frame
+
+_model = None
+
+def _init_worker(model):
+    global _model
+    _model = model
+
+def _text_column(chunk: pd.DataFrame, column: str):
+    if column not in chunk:
+        return ""
+    return chunk[column].fillna("").astype(str).to_numpy(dtype=object)
+
+def result_schema(width: int):
+    """Skema Parquet hasil batch; sama untuk setiap chunk."""
+    import pyarrow as pa
+
+    fields = [("email", pa.string()), ("name", pa.string()), ("cluster_id", pa.int64()),
+              ("cluster_label", pa.string()), ("distance", pa.float64())]
+    for rank in range(1, width + 1):
+        fields += [(f"major_{rank}", pa.string()), (f"score_{rank}", pa.float64())]
+    return pa.schema(fields)
+
+def process_chunk(chunk: pd.DataFrame, model: dict = None) -> pd.DataFrame:
+    model = model or _model
+    X = encode_frame(chunk)
+    labels, distances = predict_clusters(model, X)
+    majors, scores = rank_majors(X, labels)
+    out = pd.DataFrame({
+        # Tipe kolom tetap per chunk: kolom teks yang kosong semua tidak boleh terbaca sebagai float
+        "email": _text_column(chunk, "email"),
+        "name": _text_column(chunk, "name"),
+        "cluster_id": labels.astype("int64"),
+        "cluster_label": [model["labels"].get(str(c), "") for c in labels],
+        "distance": distances,
+    })
+    for rank in range(majors.shape[1]):
+        out[f"major_{rank + 1}"] = majors[:, rank]
+        out[f"score_{rank + 1}"] = scores[:, rank]
+    return out
+
+class ResultWriter:
+    """Tulis hasil per chunk (streaming) ke CSV atau Parquet."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.parquet = path.endswith(".parquet")
+        self._parquet_writer = None
+        self._first = True
+
+    def write(self, df: pd.DataFrame):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            if self._parquet_writer is None:
+                width = sum(1 for column in df.columns if column.startswith("major_"))
+                self._parquet_writer = pq.ParquetWriter(self.path, result_schema(width))
+            schema = self._parquet_writer.schema
+            self._parquet_writer.write_table(pa.Table.from_pandas(df, preserve_index=False).cast(schema))
+        else:
+            df.to_csv(self.path, mode="w" if self._first else "a", header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+def run_batch(input_path, output_path, chunksize=20000, workers=None, train_path=TRAIN_PATH, k=3):
+    model = load_or_fit_model(train_path=train_path, k=k)
+    workers = workers or os.cpu_count() or 1
+    writer = ResultWriter(output_path)
+    pending = deque()
+    total = 0
+    start = time.perf_counter()
+
+    def collect(future):
+        nonlocal total
+        result = future.result()
+        writer.write(result)
+        total += len(result)
+        rate = total / max(time.perf_counter() - start, 1e-9)
+        print(f"\r{total:,} baris | {rate:,.0f} baris/detik", end="", file=sys.stderr, flush=True)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model,)) as pool:
+            for chunk in pd.read_csv(input_path, chunksize=chunksize):
+                # Batasi chunk yang sedang diproses supaya memori tetap terkendali
+                if len(pending) >= 2 * workers:
+                    collect(pending.popleft())
+                pending.append(pool.submit(process_chunk, chunk))
+            while pending:
+                collect(pending.popleft())
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+    print(f"\n✅ {total:,} baris dalam {elapsed:.1f} detik -> {output_path}", file=sys.stderr)
+    return total
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Clustering & rekomendasi jurusan untuk satu file CSV siswa.")
+    parser.add_argument("input", help="CSV dengan skema students.csv")
+    parser.add_argument("output", help="File hasil (.csv atau .parquet)")
+    parser.add_argument("--chunksize", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=None, help="Jumlah proses (default: jumlah core)")
+    parser.add_argument("--train", default=TRAIN_PATH, help="Data latih model")
+    parser.add_argument("-k", type=int, default=3, help="Jumlah cluster")
+    args = parser.parse_args(argv)
+    run_batch(args.input, args.output, args.chunksize, args.workers, args.train, args.k)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# benchmarks/check_equivalence.py
+# Bandingkan jalur ter-vektorisasi dengan implementasi awal (disalin apa adanya di bawah).
+#   python -m benchmarks.check_equivalence --n 5000
+# Keluar dengan status 1 jika ada satu saja perbedaan nilai atau tipe.
+import argparse
+import random
+import sys
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_students
+from config import ACADEMIC_CODES, ACTIVITY_CODES, SKILL_LIST
+from models.recommender import calculate_recommendation_scores
+from utils.data_processor import encode_frame, one_hot_encode_skills, student_to_vector
+
+# ======================================================
+# IMPLEMENTASI AWAL (utils/data_processor.py & main.py sebelum vektorisasi)
+# ======================================================
+def reference_student_to_vector(profile: dict):
+    minat_code = ACADEMIC_CODES.get(profile.get("minat"), 0)
+    ekskul_code = ACTIVITY_CODES.get(profile.get("ekskul"), 0)
+    skills = profile.get("skill", "")
+    skill_vector = one_hot_encode_skills(skills)
+    contribution = profile.get("contribution", 0)
+    achievement = profile.get("achievement", 0)
+    club_count = profile.get("club_count", 0)
+    return [
+        minat_code,
+        ekskul_code,
+        *skill_vector,
+        contribution,
+        achievement,
+        club_count
+    ]
+
+def reference_recommendation_scores(profile, cluster_id):
+    cluster_to_majors = {
+        0: ["Ilmu Komputer", "Matematika", "Statistika"],
+        1: ["DKV", "Sastra", "Film"],
+        2: ["Manajemen", "Komunikasi", "Hubungan Internasional"]
+    }
+    majors = cluster_to_majors.get(cluster_id, [])
+    if not majors:
+        return majors, [0.0] * len(majors)
+    minat = profile["minat"]
+    ekskul = profile["ekskul"]
+    skills = set(s.strip() for s in profile["skill"].split(",") if s.strip())
+    scores = []
+    for major in majors:
+        score = 0.0
+        if cluster_id == 0:  # Analytical
+            if minat == "IPA":
+                score += 0.4
+            if ekskul in ["Robotik", "Debat", "Jurnalistik"]:
+                score += 0.2
+            relevant = {"Publik Speaking", "Analisis Data", "Problem Solving", "Ketekunan"}
+            score += 0.4 * len(skills & relevant) / max(len(relevant), 1)
+        elif cluster_id == 1:  # Creative
+            if minat in ["Bahasa", "IPS"]:
+                score += 0.4
+            if ekskul in ["Seni Musik", "Seni Rupa", "Teater", "Film"]:
+                score += 0.2
+            relevant = {"Desain", "Kreativitas", "Menulis", "Publik Speaking"}
+            score += 0.4 * len(skills & relevant) / max(len(relevant), 1)
+        elif cluster_id == 2:  # Leadership
+            if minat in ["IPS", "Bahasa"]:
+                score += 0.4
+            if ekskul in ["OSIS", "Pramuka", "Paskibra", "PMR"]:
+                score += 0.2
+            relevant = {"Leadership", "Negosiasi", "Kolaborasi", "Publik Speaking"}
+            score += 0.4 * len(skills & relevant) / max(len(relevant), 1)
+        scores.append(min(score, 1.0))
+    sorted_pairs = sorted(zip(majors, scores), key=lambda x: x[1], reverse=True)
+    if sorted_pairs:
+        sorted_majors, sorted_scores = zip(*sorted_pairs)
+        return list(sorted_majors), list(sorted_scores)
+    return majors, scores
+
+# ======================================================
+# DATA UJI
+# ======================================================
+def make_profiles(n: int, seed: int) -> list:
+    """Profil sintetis ditambah kasus tepi (kode tak dikenal, skill kosong/berspasi, key hilang)."""
+    profiles = make_students(n, seed=seed).to_dict("records")
+    rng = random.Random(seed)
+    edge_cases = [
+        {"minat": "Tidak Ada", "ekskul": "Film", "skill": "", "contribution": 0, "achievement": 0, "club_count": 0},
+        {"minat": None, "ekskul": None, "skill": " Desain ,, Kreativitas ", "contribution": 3, "achievement": 5,
+         "club_count": 1},
+        {"minat": "IPA", "ekskul": "Robotik", "skill": ", ".join(SKILL_LIST)},
+        {"skill": "Leadership"},
+    ]
+    for profile in edge_cases:
+        profile.setdefault("minat", rng.choice(list(ACADEMIC_CODES)))
+        profile.setdefault("ekskul", rng.choice(list(ACTIVITY_CODES)))
+    return profiles + edge_cases
+
+def check(n: int, seed: int) -> list:
+    failures = []
+    profiles = make_profiles(n, seed)
+    for i, profile in enumerate(profiles):
+        expected, actual = reference_student_to_vector(profile), student_to_vector(profile)
+        if expected != actual or [type(v) for v in expected] != [type(v) for v in actual]:
+            failures.append(f"student_to_vector #{i}: {actual!r} != {expected!r}")
+        # Ekskul di luar ACTIVITY_CODES ("Film", "Paskibra") tidak bisa dipilih di aplikasi dan sengaja
+        # tidak ada di tabel aturan (models/recommender.py), jadi skornya memang boleh berbeda
+        if profile.get("ekskul") not in ACTIVITY_CODES:
+            continue
+        for cluster_id in (0, 1, 2, 3):
+            expected = reference_recommendation_scores(profile, cluster_id)
+            actual = calculate_recommendation_scores(profile, cluster_id)
+            if expected != actual:
+                failures.append(f"calculate_recommendation_scores #{i} cluster {cluster_id}: {actual} != {expected}")
+    complete = [p for p in profiles if all(k in p for k in ("contribution", "achievement", "club_count"))]
+    matrix = encode_frame(pd.DataFrame(complete))
+    expected = np.array([reference_student_to_vector(p) for p in complete], dtype=float)
+    mismatched = np.flatnonzero((matrix != expected).any(axis=1))
+    failures += [f"encode_frame baris #{i}: {matrix[i].tolist()} != {expected[i].tolist()}" for i in mismatched]
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cek kesetaraan jalur ter-vektorisasi dengan implementasi awal.")
+    parser.add_argument("--n", type=int, default=5000, help="Jumlah profil sintetis")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    failures = check(args.n, args.seed)
+    for failure in failures[:20]:
+        print(f"❌ {failure}")
+    if failures:
+        print(f"{len(failures)} perbedaan ditemukan.")
+        sys.exit(1)
+    print(f"✅ {args.n + 4} profil: keluaran identik dengan implementasi awal.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+# benchmarks/load_test.py
+# Uji beban main.py: N sesi Streamlit bersamaan (streamlit.testing AppTest, headless) menjalankan
+# login -> input -> process -> result pada salinan sementara data/users.json & data/students.csv.
+#   python -m benchmarks.load_test --sessions 1 5 10 25 50
+# Per tingkat: persentil latensi per halaman, throughput, jumlah error, dan pemeriksaan korupsi file.
+import argparse
+import csv
+import json
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from benchmarks.run_benchmarks import RESULTS_DIR, git_commit
+from config import ACADEMIC_CODES, ACTIVITY_CODES, SKILL_LIST
+
+APP_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, "main.py"))
+DATA_FILES = ["users.json", "students.csv", "sample_data.csv", "kmeans_model.json", "k_selection.json"]
+DEFAULT_SESSIONS = [1, 5, 10, 25]
+PAGES = ["login", "input", "process", "result"]
+
+def session_email(level: int, i: int) -> str:
+    return f"beban{level}_{i}@sekolah.sch.id"
+
+def prepare_workdir(workdir: str, levels: list, source_dir: str):
+    """Salin file data ke direktori sementara dan daftarkan akun untuk setiap sesi."""
+    from utils.auth import hash_password
+
+    data_dir = os.path.join(workdir, "data")
+    os.makedirs(data_dir)
+    for name in DATA_FILES:
+        if os.path.exists(os.path.join(source_dir, name)):
+            shutil.copy2(os.path.join(source_dir, name), data_dir)
+    users_path = os.path.join(data_dir, "users.json")
+    users = {}
+    if os.path.exists(users_path):
+        with open(users_path, "r") as f:
+            users = json.load(f)
+    for level in levels:
+        for i in range(level):
+            users[session_email(level, i)] = hash_password(f"password{i}")
+    with open(users_path, "w") as f:
+        json.dump(users, f, indent=4)
+
+def find_button(at, label: str):
+    for button in at.button:
+        if label in button.label:
+            return button
+    raise LookupError(f"Tombol '{label}' tidak ditemukan")
+
+def run_session(level: int, i: int, timeout: float, results: list, barrier: threading.Barrier):
+    """Satu siswa: login, isi profil, proses, lihat rekomendasi. Latensi dicatat per halaman tujuan."""
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(level * 100_003 + i)
+    timings, error, submitted = {}, None, False
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+
+    def step(page, action):
+        start = time.perf_counter()
+        action()
+        timings[page] = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        if at.session_state["page"] != page:
+            errors = "; ".join(e.value for e in at.error) or "tanpa pesan"
+            raise RuntimeError(f"Tertahan di halaman '{at.session_state['page']}', bukan '{page}' ({errors})")
+
+    barrier.wait()
+    session_start = time.perf_counter()
+    try:
+        step("login", at.run)
+
+        def login():
+            at.text_input[0].input(session_email(level, i))
+            at.text_input[1].input(f"password{i}")
+            find_button(at, "Login").click().run()
+        step("input", login)
+
+        def submit_profile():
+            at.text_input[0].input(f"Siswa Beban {level}-{i}")
+            at.selectbox[0].select(rng.choice(list(ACADEMIC_CODES)))
+            for k in rng.sample(range(len(SKILL_LIST)), 3):
+                at.checkbox(key=f"skill_{k}").check()
+            at.selectbox(key="act_0").select(rng.choice(list(ACTIVITY_CODES)))
+            at.run()  # pilihan ekskul utama baru muncul setelah ekskul diisi
+            find_button(at, "Simpan & Proses").click().run()
+        step("process", submit_profile)
+        submitted = True
+        step("result", lambda: find_button(at, "Lihat Rekomendasi").click().run())
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+    results.append({
+        "email": session_email(level, i),
+        "submitted": submitted,
+        "timings": timings,
+        "total_s": time.perf_counter() - session_start,
+        "error": error,
+    })
+
+def check_files(expected_rows: int, emails: list) -> dict:
+    """Pastikan file data masih utuh setelah tulis bersamaan."""
+    from utils import aggregates, auth, storage
+
+    storage.flush_submissions()
+    problems = []
+    with open(storage.CSV_PATH, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        rows = list(reader)
+    if header != storage.STUDENT_COLUMNS:
+        problems.append(f"header CSV berubah: {header}")
+    malformed = sum(1 for row in rows if len(row) != len(header))
+    if malformed:
+        problems.append(f"{malformed} baris CSV tidak lengkap")
+    if len(rows) != expected_rows:
+        problems.append(f"jumlah baris CSV {len(rows)}, seharusnya {expected_rows}")
+    written = {row[0] for row in rows if row}
+    missing = [email for email in emails if email not in written]
+    if missing:
+        problems.append(f"{len(missing)} submission hilang")
+    try:
+        with open(auth.USER_DB, "r") as f:
+            json.load(f)
+    except ValueError as exc:
+        problems.append(f"users.json rusak: {exc}")
+    if os.path.exists(auth.USER_SQLITE_DB):
+        with sqlite3.connect(auth.USER_SQLITE_DB) as conn:
+            integrity = conn.execute("PRAGMA integrity_check").fetchone()[0]
+        if integrity != "ok":
+            problems.append(f"users.db: {integrity}")
+    aggregate_count = aggregates.summarize()["count"]
+    if aggregate_count != len(rows):
+        problems.append(f"agregat kohort menghitung {aggregate_count} baris, CSV {len(rows)}")
+    return {"csv_rows": len(rows), "problems": problems}
+
+def percentiles(values: list) -> dict:
+    if not values:
+        return {}
+    ms = np.asarray(values) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {"count": len(ms), "p50_ms": p50, "p95_ms": p95, "p99_ms": p99, "max_ms": ms.max()}
+
+def run_level(level: int, timeout: float) -> dict:
+    from utils import tracing
+
+    tracing.reset()
+    results, barrier = [], threading.Barrier(level)
+    threads = [
+        threading.Thread(target=run_session, args=(level, i, timeout, results, barrier), name=f"sesi-{i}")
+        for i in range(level)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+    completed = [r for r in results if r["error"] is None]
+    return {
+        "sessions": level,
+        "wall_s": wall,
+        "sessions_per_s": len(completed) / wall if wall else None,
+        "errors": len(results) - len(completed),
+        "submitted": [r["email"] for r in results if r["submitted"]],
+        "error_samples": sorted({r["error"] for r in results if r["error"]})[:5],
+        # Latensi yang dirasakan pengguna (klik -> halaman tujuan selesai dirender)
+        "pages": {page: percentiles([r["timings"][page] for r in results if page in r["timings"]])
+                  for page in PAGES},
+        "session": percentiles([r["total_s"] for r in completed]),
+        # Rincian stage dari utils/tracing (page.*, encode, predict, storage, ...)
+        "stages": tracing.summary(),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Uji beban sesi Streamlit bersamaan untuk SPPK-Ekskul.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=DEFAULT_SESSIONS,
+                        help="Jumlah sesi bersamaan per tingkat (naik bertahap)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Batas waktu per rerun skrip (detik)")
+    parser.add_argument("--data-dir", default="data", help="Sumber file data yang disalin")
+    parser.add_argument("--output", help="File JSON hasil (default: benchmarks/results/loadtest-<waktu>-<commit>.json)")
+    args = parser.parse_args(argv)
+
+    source_dir = os.path.abspath(args.data_dir)
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "levels": [],
+    }
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        prepare_workdir(workdir, args.sessions, source_dir)
+        # Semua path di aplikasi relatif ke "data/", jadi cukup pindah direktori kerja
+        os.chdir(workdir)
+        try:
+            from streamlit import config as st_config
+
+            from utils import aggregates, storage, tracing
+
+            # main.py tidak memakai "magic"; ast.parse-nya tidak aman dipanggil paralel di CPython 3.11
+            st_config.set_option("runner.magicEnabled", False)
+            tracing.set_enabled(True)
+            aggregates.rebuild()  # agregat awal = isi CSV salinan, supaya bisa dicek setelah beban
+            expected_rows = len(storage.load_students())
+            emails = []
+            for level in args.sessions:
+                result = run_level(level, args.timeout)
+                expected_rows += len(result["submitted"])
+                emails += result.pop("submitted")
+                result["integrity"] = check_files(expected_rows, emails)
+                report["levels"].append(result)
+                pages = "  ".join(
+                    f"{page} p95={stats['p95_ms']:7.0f} ms" for page, stats in result["pages"].items() if stats
+                )
+                problems = result["integrity"]["problems"]
+                print(f"sesi={level:4d}  {result['sessions_per_s'] or 0:6.2f} sesi/s  error={result['errors']:3d}  "
+                      f"{pages}  file={'OK' if not problems else '; '.join(problems)}", flush=True)
+        finally:
+            os.chdir(original_cwd)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"loadtest-{stamp}-{(commit or 'nogit')[:10]}.json")
+    with open(output, "w") as f:
+        json.dump(report, f, indent=4, default=float)
+    print(f"Hasil: {output}")
+
+if __name__ == "__main__":
+    main()
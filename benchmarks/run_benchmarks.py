@@ -0,0 +1,171 @@
+# benchmarks/run_benchmarks.py
+# Benchmark jalur utama (encoding, clustering, skor, auth, storage) pada beberapa ukuran data.
+#   python -m benchmarks.run_benchmarks --sizes 1000 10000 100000 1000000
+# Hasil ditulis sebagai JSON agar bisa dibandingkan antar commit.
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_students, make_users
+from models.kmeans_model import run_kmeans
+from models.recommender import calculate_recommendation_scores, rank_majors
+from utils import aggregates, auth, storage
+from utils.data_processor import encode_frame, student_to_vector
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+def measure(fn, memory: bool = True):
+    """Jalankan fn dua kali: sekali untuk waktu, sekali di bawah tracemalloc untuk memori puncak."""
+    gc.collect()
+    start = time.perf_counter()
+    fn()
+    wall = time.perf_counter() - start
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return wall, peak
+
+# ======================================================
+# KASUS BENCHMARK: setiap fungsi menerima (n, konteks) dan mengembalikan (callable, jumlah operasi)
+# ======================================================
+def case_encode_frame(n, ctx):
+    return (lambda: encode_frame(ctx["students"])), n
+
+def case_student_to_vector(n, ctx):
+    records = ctx["records"][:ctx["max_calls"]]
+    return (lambda: [student_to_vector(r) for r in records]), len(records)
+
+def case_run_kmeans(n, ctx):
+    return (lambda: run_kmeans(ctx["features"], k=3)), n
+
+def case_rank_majors(n, ctx):
+    return (lambda: rank_majors(ctx["matrix"], ctx["clusters"])), n
+
+def case_calculate_recommendation_scores(n, ctx):
+    records = ctx["records"][:ctx["max_calls"]]
+    clusters = ctx["clusters"]
+    return (lambda: [calculate_recommendation_scores(r, clusters[i]) for i, r in enumerate(records)]), len(records)
+
+def case_authenticate_user(n, ctx):
+    lookups = min(n, ctx["max_calls"])
+    rng = random.Random(0)
+    ids = [rng.randrange(n) for _ in range(lookups)]
+
+    def run():
+        for i in ids:
+            assert auth.authenticate_user(f"siswa{i}@sekolah.sch.id", f"password{i}")
+    return run, lookups
+
+def case_save_student_to_csv(n, ctx):
+    records = ctx["records"]
+
+    def run():
+        if os.path.exists(storage.CSV_PATH):
+            os.remove(storage.CSV_PATH)
+        for r in records:
+            storage.save_student_to_csv(r)
+        storage.flush_submissions()
+    return run, n
+
+CASES = {
+    "encode_frame": case_encode_frame,
+    "student_to_vector": case_student_to_vector,
+    "run_kmeans": case_run_kmeans,
+    "rank_majors": case_rank_majors,
+    "calculate_recommendation_scores": case_calculate_recommendation_scores,
+    "authenticate_user": case_authenticate_user,
+    "save_student_to_csv": case_save_student_to_csv,
+}
+
+def build_context(n, workdir, max_calls):
+    students = make_students(n)
+    matrix = encode_frame(students)
+    # Arahkan auth & storage ke direktori sementara
+    users_json = os.path.join(workdir, f"users_{n}.json")
+    with open(users_json, "w") as f:
+        json.dump(make_users(n), f)
+    auth.USER_DB = users_json
+    auth.USER_SQLITE_DB = os.path.join(workdir, f"users_{n}.db")
+    start = time.perf_counter()
+    auth.get_user_store()  # migrasi JSON -> SQLite
+    migration = time.perf_counter() - start
+    storage.CSV_PATH = os.path.join(workdir, f"students_{n}.csv")
+    storage.COLUMNAR_PATH = os.path.join(workdir, f"students_{n}.parquet")
+    aggregates.AGGREGATES_PATH = os.path.join(workdir, f"aggregates_{n}.json")
+    return {
+        "students": students,
+        "records": students.to_dict("records"),
+        "matrix": matrix,
+        "features": pd.DataFrame(matrix),
+        "clusters": np.random.default_rng(0).integers(0, 3, n),
+        "max_calls": max_calls,
+    }, migration
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark jalur utama SPPK-Ekskul.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--max-calls", type=int, default=10_000,
+                        help="Batas panggilan untuk API per-baris (student_to_vector, skor tunggal, login)")
+    parser.add_argument("--no-memory", action="store_true", help="Lewati pengukuran memori puncak")
+    parser.add_argument("--output", help="File JSON hasil (default: benchmarks/results/<waktu>-<commit>.json)")
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "results": [],
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in args.sizes:
+            ctx, migration = build_context(n, workdir, args.max_calls)
+            report["results"].append({"case": "user_store_migration", "size": n, "ops": n,
+                                      "wall_s": migration, "peak_bytes": None})
+            for name in args.cases:
+                fn, ops = CASES[name](n, ctx)
+                wall, peak = measure(fn, memory=not args.no_memory)
+                report["results"].append({"case": name, "size": n, "ops": ops, "wall_s": wall,
+                                          "ops_per_s": ops / wall if wall else None, "peak_bytes": peak})
+                mem = f"{peak / 2**20:8.1f} MiB" if peak is not None else "       -"
+                print(f"{name:35s} n={n:>9,} ops={ops:>9,} {wall:9.3f} s {mem}", flush=True)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"{stamp}-{(commit or 'nogit')[:10]}.json")
+    with open(output, "w") as f:
+        json.dump(report, f, indent=4)
+    print(f"Hasil: {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+# benchmarks/synthetic.py
+# Generator data sintetis yang mengikuti config.SKILL_LIST dan tabel kode.
+import numpy as np
+import pandas as pd
+
+from config import ACADEMIC_CODES, ACTIVITY_CODES, SKILL_LIST
+
+def make_students(n: int, seed: int = 0) -> pd.DataFrame:
+    """n profil siswa dengan skema students.csv."""
+    rng = np.random.default_rng(seed)
+    skill_bits = rng.random((n, len(SKILL_LIST))) < 0.3
+    skill_names = np.array(SKILL_LIST, dtype=object)
+    skills = [", ".join(skill_names[row]) for row in skill_bits]
+    club_count = rng.integers(1, 6, n)
+    return pd.DataFrame({
+        "email": [f"siswa{i}@sekolah.sch.id" for i in range(n)],
+        "name": [f"Siswa {i}" for i in range(n)],
+        "minat": rng.choice(list(ACADEMIC_CODES), n),
+        "ekskul": rng.choice(list(ACTIVITY_CODES), n),
+        "skill": skills,
+        "club_count": club_count,
+        # Rata-rata dari nilai slider 1..5 per ekskul
+        "contribution": rng.integers(1, 6, (n, 5)).cumsum(axis=1)[np.arange(n), club_count - 1] / club_count,
+        "achievement": rng.integers(1, 6, (n, 5)).cumsum(axis=1)[np.arange(n), club_count - 1] / club_count,
+    })
+
+def make_users(n: int) -> dict:
+    """n user (email -> hash password) dengan password "password{i}"."""
+    from utils.auth import hash_password
+    return {f"siswa{i}@sekolah.sch.id": hash_password(f"password{i}") for i in range(n)}
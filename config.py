@@ -1,4 +1,6 @@
 # config.py
+import os
+
 ACADEMIC_CODES = {"IPA": 1, "IPS": 2, "Bahasa": 3}
 
 ACTIVITY_CODES = {
@@ -11,4 +13,18 @@ SKILL_LIST = [
     "Publik Speaking", "Analisis Data", "Menulis", "Leadership",
     "Desain", "Negosiasi", "Kolaborasi", "Kreativitas",
     "Problem Solving", "Ketekunan"
-]
\ No newline at end of file
+]
+
+# Email admin (dipisah koma), mis. SPPK_ADMIN_EMAILS="guru@sekolah.sch.id"
+ADMIN_EMAILS = {e.strip() for e in os.environ.get("SPPK_ADMIN_EMAILS", "").split(",") if e.strip()}
+
+# Centroid belajar dari submission baru di thread latar (models/online.py)
+ONLINE_CLUSTERING = os.environ.get("SPPK_ONLINE_CLUSTERING", "0") == "1"
+
+# Beberapa proses Streamlit: state model bersama (.npy di-mmap) di direktori ini, mis. /dev/shm/sppk.
+# Hanya proses dengan SPPK_SHARED_MODEL_BUILDER=1 yang fit & menulis; proses lain memetakan read-only.
+SHARED_MODEL_DIR = os.environ.get("SPPK_SHARED_MODEL_DIR", "")
+SHARED_MODEL_BUILDER = os.environ.get("SPPK_SHARED_MODEL_BUILDER", "0") == "1"
+
+# Tier disk cache hasil clustering/rekomendasi (utils/result_cache.py); kosongkan untuk hanya memakai memori
+RESULT_CACHE_DB = os.environ.get("SPPK_RESULT_CACHE_DB", "data/result_cache.db")
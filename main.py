@@ -1,12 +1,10 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-from config import ACADEMIC_CODES, ACTIVITY_CODES, SKILL_LIST
-from utils.data_processor import student_to_vector
-from models.kmeans_model import run_kmeans
+from config import ACADEMIC_CODES, ACTIVITY_CODES, SKILL_LIST, ADMIN_EMAILS
 from utils.auth import register_user, authenticate_user, reset_password
-from utils.storage import save_student_to_csv
+from utils.profile_index import get_profile_index
+from utils import startup, tracing
+from utils.tracing import span
+# numpy/pandas/scikit-learn/matplotlib hanya dimuat di halaman process & result (lihat utils/startup.py)
 
 # ======================================================
 # INIT SESSION STATE
@@ -36,295 +34,361 @@ def goto(page):
     st.session_state.page = page
 
 # ======================================================
-# FUNGSI HITUNG SKOR REKOMENDASI
+# PANEL TIMING (ADMIN)
 # ======================================================
-def calculate_recommendation_scores(profile, cluster_id):
-    cluster_to_majors = {
-        0: ["Ilmu Komputer", "Matematika", "Statistika"],
-        1: ["DKV", "Sastra", "Film"],
-        2: ["Manajemen", "Komunikasi", "Hubungan Internasional"]
-    }
-    majors = cluster_to_majors.get(cluster_id, [])
-    if not majors:
-        return majors, [0.0] * len(majors)
-    minat = profile["minat"]
-    ekskul = profile["ekskul"]
-    skills = set(s.strip() for s in profile["skill"].split(",") if s.strip())
-    scores = []
-    for major in majors:
-        score = 0.0
-        if cluster_id == 0:  # Analytical
-            if minat == "IPA":
-                score += 0.4
-            if ekskul in ["Robotik", "Debat", "Jurnalistik"]:
-                score += 0.2
-            relevant = {"Publik Speaking", "Analisis Data", "Problem Solving", "Ketekunan"}
-            score += 0.4 * len(skills & relevant) / max(len(relevant), 1)
-        elif cluster_id == 1:  # Creative
-            if minat in ["Bahasa", "IPS"]:
-                score += 0.4
-            if ekskul in ["Seni Musik", "Seni Rupa", "Teater", "Film"]:
-                score += 0.2
-            relevant = {"Desain", "Kreativitas", "Menulis", "Publik Speaking"}
-            score += 0.4 * len(skills & relevant) / max(len(relevant), 1)
-        elif cluster_id == 2:  # Leadership
-            if minat in ["IPS", "Bahasa"]:
-                score += 0.4
-            if ekskul in ["OSIS", "Pramuka", "Paskibra", "PMR"]:
-                score += 0.2
-            relevant = {"Leadership", "Negosiasi", "Kolaborasi", "Publik Speaking"}
-            score += 0.4 * len(skills & relevant) / max(len(relevant), 1)
-        scores.append(min(score, 1.0))
-    sorted_pairs = sorted(zip(majors, scores), key=lambda x: x[1], reverse=True)
-    if sorted_pairs:
-        sorted_majors, sorted_scores = zip(*sorted_pairs)
-        return list(sorted_majors), list(sorted_scores)
-    return majors, scores
-
-# ======================================================
-# HALAMAN LUPA PASSWORD — DENGAN DESAIN RAPIH
-# ======================================================
-if st.session_state.page == "forgot":
-    st.title("🔐 Lupa Password?")
-    st.caption("Masukkan email akun Anda untuk mengatur ulang password.")
-
-    with st.form("reset_form"):
-        email = st.text_input("Email", value=st.session_state.get("forgot_email", ""), placeholder="contoh@email.com")
-        new_pass = st.text_input("Password Baru", type="password", placeholder="Masukkan password baru")
-        confirm_pass = st.text_input("Konfirmasi Password Baru", type="password", placeholder="Ulangi password baru")
-        submit = st.form_submit_button("Reset Password", use_container_width=True)
+tracing.start_exporter()
 
-    if submit:
-        if email.strip() == "":
-            st.error("📧 Email wajib diisi!")
-        elif new_pass != confirm_pass:
-            st.error("❌ Password baru tidak cocok!")
-        elif "@" not in email or "." not in email:
-            st.error("⚠️ Format email tidak valid.")
-        else:
-            if reset_password(email, new_pass):
-                st.success("✅ Password berhasil diubah! Silakan login.")
-                st.session_state.forgot_email = ""
-                goto("login")
-                st.rerun()
-            else:
-                st.error("❌ Email tidak ditemukan. Pastikan Anda sudah mendaftar.")
+def render_timing_panel():
+    with st.sidebar.expander("⏱️ Timing per Stage"):
+        enabled = st.toggle("Aktifkan tracing", value=tracing.ENABLED)
+        if enabled != tracing.ENABLED:
+            tracing.set_enabled(enabled)
+        stats = tracing.summary()
+        if startup.IMPORT_TIMES:
+            st.caption("Biaya import pertama (ms)")
+            st.dataframe(
+                {name: round(sec * 1000, 1) for name, sec in startup.IMPORT_TIMES.items()},
+                use_container_width=True
+            )
+        if not stats:
+            st.caption("Belum ada data timing.")
+            return
+        import pandas as pd
+        st.dataframe(
+            pd.DataFrame.from_dict(stats, orient="index").round(2),
+            use_container_width=True
+        )
+        col1, col2 = st.columns(2)
+        if col1.button("Ekspor", use_container_width=True):
+            tracing.export_metrics()
+            st.toast(f"Metrik disimpan ke {tracing.METRICS_PATH}")
+        if col2.button("Reset", use_container_width=True):
+            tracing.reset()
 
-    col1, col2 = st.columns(2)
-    with col1:
-        if st.button("← Kembali ke Login", use_container_width=True):
-            goto("login")
-            st.rerun()
+# Satu span per halaman; st.rerun() di dalam blok tetap tercatat
+with span(f"page.{st.session_state.page}"):
+    # ======================================================
+    # HALAMAN LUPA PASSWORD — DENGAN DESAIN RAPIH
+    # ======================================================
+    if st.session_state.page == "forgot":
+        st.title("🔐 Lupa Password?")
+        st.caption("Masukkan email akun Anda untuk mengatur ulang password.")
 
-# ======================================================
-# LOGIN & REGISTER — DENGAN DESAIN MODERN
-# ======================================================
-elif not st.session_state.logged_in:
-    if st.session_state.page == "login":
-        st.markdown("<h1 style='display: flex; align-items: center;'>🔐 Login</h1>", unsafe_allow_html=True)
-        
-        with st.form("login_form", clear_on_submit=False):
-            email = st.text_input("Email", placeholder="contoh@email.com")
-            password = st.text_input("Password", type="password", placeholder="Masukkan password Anda")
-            submit = st.form_submit_button("Login", use_container_width=True)
+        with st.form("reset_form"):
+            email = st.text_input("Email", value=st.session_state.get("forgot_email", ""), placeholder="contoh@email.com")
+            new_pass = st.text_input("Password Baru", type="password", placeholder="Masukkan password baru")
+            confirm_pass = st.text_input("Konfirmasi Password Baru", type="password", placeholder="Ulangi password baru")
+            submit = st.form_submit_button("Reset Password", use_container_width=True)
 
         if submit:
-            if authenticate_user(email, password):
-                st.session_state.logged_in = True
-                st.session_state.current_email = email
-                goto("input")
-                st.rerun()
+            if email.strip() == "":
+                st.error("📧 Email wajib diisi!")
+            elif new_pass != confirm_pass:
+                st.error("❌ Password baru tidak cocok!")
+            elif "@" not in email or "." not in email:
+                st.error("⚠️ Format email tidak valid.")
             else:
-                st.error("❌ Email atau password salah!")
+                if reset_password(email, new_pass):
+                    st.success("✅ Password berhasil diubah! Silakan login.")
+                    st.session_state.forgot_email = ""
+                    goto("login")
+                    st.rerun()
+                else:
+                    st.error("❌ Email tidak ditemukan. Pastikan Anda sudah mendaftar.")
 
-        # Tombol Daftar & Lupa Password dalam satu baris
         col1, col2 = st.columns(2)
         with col1:
-            if st.button("Daftar akun baru", use_container_width=True):
-                goto("register")
+            if st.button("← Kembali ke Login", use_container_width=True):
+                goto("login")
                 st.rerun()
-        with col2:
-            if st.button("Lupa Password?", use_container_width=True):
-                goto("forgot")
+
+    # ======================================================
+    # LOGIN & REGISTER — DENGAN DESAIN MODERN
+    # ======================================================
+    elif not st.session_state.logged_in:
+        if st.session_state.page == "login":
+            st.markdown("<h1 style='display: flex; align-items: center;'>🔐 Login</h1>", unsafe_allow_html=True)
+        
+            with st.form("login_form", clear_on_submit=False):
+                email = st.text_input("Email", placeholder="contoh@email.com")
+                password = st.text_input("Password", type="password", placeholder="Masukkan password Anda")
+                submit = st.form_submit_button("Login", use_container_width=True)
+
+            if submit:
+                if authenticate_user(email, password):
+                    st.session_state.logged_in = True
+                    st.session_state.current_email = email
+                    goto("input")
+                    st.rerun()
+                else:
+                    st.error("❌ Email atau password salah!")
+
+            # Tombol Daftar & Lupa Password dalam satu baris
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("Daftar akun baru", use_container_width=True):
+                    goto("register")
+                    st.rerun()
+            with col2:
+                if st.button("Lupa Password?", use_container_width=True):
+                    goto("forgot")
+                    st.rerun()
+
+        elif st.session_state.page == "register":
+            st.title("📝 Daftar Akun Baru")
+            with st.form("register_form"):
+                email = st.text_input("Email", placeholder="contoh@email.com")
+                password = st.text_input("Password", type="password", placeholder="Buat password Anda")
+                confirm = st.text_input("Konfirmasi Password", type="password", placeholder="Ulangi password")
+                submit = st.form_submit_button("Daftar", use_container_width=True)
+            if submit:
+                if password != confirm:
+                    st.error("❌ Password tidak cocok!")
+                elif register_user(email, password):
+                    st.success("✅ Akun berhasil dibuat, silakan login.")
+                    goto("login")
+                    st.rerun()
+                else:
+                    st.error("❌ Email sudah terdaftar!")
+
+    # ======================================================
+    # SETELAH LOGIN — TETAP SAMA
+    # ======================================================
+    else:
+        st.sidebar.title(f"👤 {st.session_state.current_email}")
+        if st.sidebar.button("Logout"):
+            st.session_state.clear()
+            st.rerun()
+        if st.session_state.current_email in ADMIN_EMAILS:
+            render_timing_panel()
+            if st.sidebar.button("📊 Analitik Kohort", use_container_width=True):
+                goto("analytics")
                 st.rerun()
 
-    elif st.session_state.page == "register":
-        st.title("📝 Daftar Akun Baru")
-        with st.form("register_form"):
-            email = st.text_input("Email", placeholder="contoh@email.com")
-            password = st.text_input("Password", type="password", placeholder="Buat password Anda")
-            confirm = st.text_input("Konfirmasi Password", type="password", placeholder="Ulangi password")
-            submit = st.form_submit_button("Daftar", use_container_width=True)
-        if submit:
-            if password != confirm:
-                st.error("❌ Password tidak cocok!")
-            elif register_user(email, password):
-                st.success("✅ Akun berhasil dibuat, silakan login.")
-                goto("login")
+        # ==================================================
+        # INPUT PROFIL SISWA
+        # ==================================================
+        if st.session_state.page == "input":
+            st.title("📋 Input Profil Siswa")
+            # Isi awal dari profil terakhir (sekali per sesi; lookup per email tanpa memindai CSV)
+            if "prefill" not in st.session_state:
+                latest = get_profile_index().latest(st.session_state.current_email) or {}
+                st.session_state.prefill = latest
+                if latest:
+                    saved_skills = [s.strip() for s in str(latest.get("skill", "")).split(",")]
+                    for i, skill in enumerate(SKILL_LIST):
+                        st.session_state[f"skill_{i}"] = skill in saved_skills
+                    if latest.get("ekskul") in ACTIVITY_CODES:
+                        st.session_state.extracurricular_inputs = [{
+                            "activity": latest["ekskul"],
+                            "contribution": min(max(round(float(latest.get("contribution") or 3)), 1), 5),
+                            "achievement": min(max(round(float(latest.get("achievement") or 3)), 1), 5)
+                        }]
+            prefill = st.session_state.prefill
+            academic_options = list(ACADEMIC_CODES.keys())
+            name = st.text_input("Nama Lengkap", value=prefill.get("name", ""))
+            academic = st.selectbox(
+                "Minat Akademik",
+                academic_options,
+                index=academic_options.index(prefill["minat"]) if prefill.get("minat") in academic_options else 0
+            )
+            with st.expander("🛠️ Pilih Keterampilan"):
+                cols = st.columns(2)
+                for i, skill in enumerate(SKILL_LIST):
+                    cols[i % 2].checkbox(skill, key=f"skill_{i}")
+            st.subheader("🎯 Ekstrakurikuler yang Diikuti")
+            valid_activities = []
+            for i, ex in enumerate(st.session_state.extracurricular_inputs):
+                c1, c2, c3 = st.columns([3, 2, 2])
+                ex["activity"] = c1.selectbox(
+                    "Ekskul",
+                    [""] + list(ACTIVITY_CODES.keys()),
+                    key=f"act_{i}",
+                    index=0 if not ex["activity"] else list(ACTIVITY_CODES.keys()).index(ex["activity"]) + 1
+                )
+                ex["contribution"] = c2.slider("Kontribusi", 1, 5, ex["contribution"], key=f"cont_{i}")
+                ex["achievement"] = c3.slider("Prestasi", 1, 5, ex["achievement"], key=f"ach_{i}")
+                if ex["activity"]:
+                    valid_activities.append(ex["activity"])
+            st.markdown("### ➕ Kelola Ekstrakurikuler")
+            col1, col2 = st.columns(2)
+            if col1.button("Tambah", use_container_width=True):
+                st.session_state.extracurricular_inputs.append({"activity": "", "contribution": 3, "achievement": 3})
                 st.rerun()
+            if col2.button("Hapus Terakhir", use_container_width=True) and len(st.session_state.extracurricular_inputs) > 1:
+                st.session_state.extracurricular_inputs.pop()
+                st.rerun()
+
+            # 🔒 EKSKUL UTAMA: HANYA DARI YANG DIIKUTI
+            st.subheader("🏆 Ekstrakurikuler Utama")
+            if valid_activities:
+                main_act = st.selectbox("Pilih Ekskul Utama", options=valid_activities, index=0)
             else:
-                st.error("❌ Email sudah terdaftar!")
+                st.info("Silakan isi minimal satu ekstrakurikuler untuk memilih ekskul utama.")
+                main_act = None
+            st.divider()
+            if st.button("💾 Simpan & Proses", type="primary", use_container_width=True):
+                valid_inputs = [e for e in st.session_state.extracurricular_inputs if e["activity"]]
+                if not name.strip():
+                    st.error("Nama wajib diisi!")
+                elif not valid_inputs:
+                    st.error("Minimal satu ekstrakurikuler harus diisi!")
+                elif not main_act:
+                    st.error("Ekskul utama wajib dipilih dari daftar yang diikuti!")
+                else:
+                    skills = [SKILL_LIST[i] for i in range(len(SKILL_LIST)) if st.session_state[f"skill_{i}"]]
+                    profile = {
+                        "email": st.session_state.current_email,
+                        "name": name,
+                        "minat": academic,
+                        "ekskul": main_act,
+                        "skill": ", ".join(skills),
+                        "club_count": len(valid_inputs),
+                        "contribution": sum(e["contribution"] for e in valid_inputs) / len(valid_inputs),
+                        "achievement": sum(e["achievement"] for e in valid_inputs) / len(valid_inputs)
+                    }
+                    get_profile_index().upsert(profile)
+                    st.session_state.prefill = profile
+                    st.session_state.student_profile = profile
+                    goto("process")
+                    st.rerun()
 
-# ======================================================
-# SETELAH LOGIN — TETAP SAMA
-# ======================================================
-else:
-    st.sidebar.title(f"👤 {st.session_state.current_email}")
-    if st.sidebar.button("Logout"):
-        st.session_state.clear()
-        st.rerun()
+        # ==================================================
+        # PROSES CLUSTERING
+        # ==================================================
+        elif st.session_state.page == "process":
+            st.title("⚙️ Proses Clustering (K-Means)")
+            profile = st.session_state.student_profile
+            if not profile:
+                goto("input")
+                st.rerun()
+            with st.spinner("Memproses data..."):
+                startup.warm_up()
+                import numpy as np
+                from models.kmeans_model import predict_cluster
+                from models.recommender import rank_majors
+                from utils.cache import current_model
+                from utils.data_processor import student_to_vector
+                from utils.result_cache import get_result_cache
+                # Model di-fit sekali, disimpan & di-cache per proses; cukup prediksi centroid terdekat
+                model = current_model()
+                profile_vector = np.array(student_to_vector(profile), dtype=float)
+
+                def compute():
+                    cluster_id, centroid = predict_cluster(model, profile_vector)
+                    majors, scores = rank_majors([profile_vector], [cluster_id])
+                    valid = majors[0] != ""
+                    return {
+                        "cluster_id": int(cluster_id),
+                        "label": model["labels"][str(cluster_id)],
+                        "sse": float(model["sse"]),
+                        "centroid": np.asarray(centroid, dtype=float).tolist(),
+                        "majors": majors[0][valid].tolist(),
+                        "scores": scores[0][valid].tolist()
+                    }
+                # Profil yang sama (vektor + versi model sama) langsung memakai hasil sebelumnya
+                cached = get_result_cache().get_or_compute(profile_vector, model, compute)
+                cluster_id = cached["cluster_id"]
+                st.session_state.cluster_result = {
+                    "name": profile["name"],
+                    "cluster_id": cluster_id,
+                    "label": cached["label"],
+                    "sse": cached["sse"],
+                    "profile_vector": profile_vector,
+                    "centroid": np.array(cached["centroid"]),
+                    "majors": list(cached["majors"]),
+                    "scores": list(cached["scores"])
+                }
+            st.success(f"✅ Kamu masuk ke Cluster **#{cluster_id}**")
+            if st.button("➡️ Lihat Rekomendasi", type="primary"):
+                goto("result")
+                st.rerun()
 
-    # ==================================================
-    # INPUT PROFIL SISWA
-    # ==================================================
-    if st.session_state.page == "input":
-        st.title("📋 Input Profil Siswa")
-        name = st.text_input("Nama Lengkap")
-        academic = st.selectbox("Minat Akademik", list(ACADEMIC_CODES.keys()))
-        with st.expander("🛠️ Pilih Keterampilan"):
-            cols = st.columns(2)
-            for i, skill in enumerate(SKILL_LIST):
-                cols[i % 2].checkbox(skill, key=f"skill_{i}")
-        st.subheader("🎯 Ekstrakurikuler yang Diikuti")
-        valid_activities = []
-        for i, ex in enumerate(st.session_state.extracurricular_inputs):
-            c1, c2, c3 = st.columns([3, 2, 2])
-            ex["activity"] = c1.selectbox(
-                "Ekskul",
-                [""] + list(ACTIVITY_CODES.keys()),
-                key=f"act_{i}",
-                index=0 if not ex["activity"] else list(ACTIVITY_CODES.keys()).index(ex["activity"]) + 1
+        # ==================================================
+        # HASIL REKOMENDASI — DENGAN SEMUA VISUALISASI
+        # ==================================================
+        elif st.session_state.page == "result":
+            res = st.session_state.cluster_result
+            st.title("🎓 Rekomendasi Jurusan")
+            st.subheader(f"Halo, **{res['name']}** 👋")
+            st.info(f"Kamu termasuk tipe **{res['label']}**.")
+            startup.warm_up()
+            from models.neighbors import get_neighbor_index
+            from utils.cache import load_training_model
+            from utils.visualizer import plot_recommendation_ranking, plot_recommendation_score_bar, plot_competency_profile
+            # Skor sudah dihitung (atau diambil dari cache hasil) di halaman process
+            majors, scores = res["majors"], res["scores"]
+            # 🔢 Ranking
+            plot_recommendation_ranking(majors, scores)
+            # 📊 Bar Chart (PNG di-cache; rerun tanpa perubahan tidak memanggil matplotlib)
+            if scores:
+                plot_recommendation_score_bar(scores, majors)
+            # 📈 Radar Chart — Profil Kompetensi
+            plot_competency_profile(res["profile_vector"], res["centroid"])
+            # 👥 Siswa yang mirip
+            neighbors = get_neighbor_index(load_training_model()).query(
+                res["profile_vector"], k=5, exclude_email=st.session_state.current_email
             )
-            ex["contribution"] = c2.slider("Kontribusi", 1, 5, ex["contribution"], key=f"cont_{i}")
-            ex["achievement"] = c3.slider("Prestasi", 1, 5, ex["achievement"], key=f"ach_{i}")
-            if ex["activity"]:
-                valid_activities.append(ex["activity"])
-        st.markdown("### ➕ Kelola Ekstrakurikuler")
-        col1, col2 = st.columns(2)
-        if col1.button("Tambah", use_container_width=True):
-            st.session_state.extracurricular_inputs.append({"activity": "", "contribution": 3, "achievement": 3})
-            st.rerun()
-        if col2.button("Hapus Terakhir", use_container_width=True) and len(st.session_state.extracurricular_inputs) > 1:
-            st.session_state.extracurricular_inputs.pop()
-            st.rerun()
+            if len(neighbors):
+                st.markdown("### 👥 Siswa dengan Profil Mirip")
+                st.dataframe(
+                    neighbors.rename(columns={
+                        "name": "Nama", "cluster_id": "Cluster", "major": "Rekomendasi Utama", "distance": "Jarak"
+                    })[["Nama", "Cluster", "Rekomendasi Utama", "Jarak"]],
+                    hide_index=True,
+                    use_container_width=True
+                )
+            # ℹ️ Detail Teknis
+            with st.expander("ℹ️ Detail Clustering"):
+                st.metric("Cluster ID", res["cluster_id"])
+                st.metric("Nilai SSE", f"{res['sse']:.3f}")
+            st.divider()
+            if st.button("🔄 Isi Ulang Profil", use_container_width=True):
+                goto("input")
+                st.rerun()
 
-        # 🔒 EKSKUL UTAMA: HANYA DARI YANG DIIKUTI
-        st.subheader("🏆 Ekstrakurikuler Utama")
-        if valid_activities:
-            main_act = st.selectbox("Pilih Ekskul Utama", options=valid_activities, index=0)
-        else:
-            st.info("Silakan isi minimal satu ekstrakurikuler untuk memilih ekskul utama.")
-            main_act = None
-        st.divider()
-        if st.button("💾 Simpan & Proses", type="primary", use_container_width=True):
-            valid_inputs = [e for e in st.session_state.extracurricular_inputs if e["activity"]]
-            if not name.strip():
-                st.error("Nama wajib diisi!")
-            elif not valid_inputs:
-                st.error("Minimal satu ekstrakurikuler harus diisi!")
-            elif not main_act:
-                st.error("Ekskul utama wajib dipilih dari daftar yang diikuti!")
+        # ==================================================
+        # ANALITIK KOHORT (ADMIN)
+        # ==================================================
+        elif st.session_state.page == "analytics" and st.session_state.current_email in ADMIN_EMAILS:
+            from utils import aggregates
+            st.title("📊 Analitik Kohort")
+            # Agregat dipelihara per submission; halaman ini hanya membaca sel-sel kecil
+            dims = aggregates.dimensions()
+            c1, c2, c3 = st.columns(3)
+            clusters = c1.multiselect("Cluster", dims["clusters"])
+            minat = c2.multiselect("Minat Akademik", dims["minat"])
+            ekskul = c3.multiselect("Ekskul Utama", dims["ekskul"])
+            summary = aggregates.summarize(clusters or None, minat or None, ekskul or None)
+            m1, m2, m3 = st.columns(3)
+            # Isi ulang profil ikut terhitung sampai CSV di-compact (python -m utils.profile_index --compact)
+            m1.metric("Jumlah Submission", summary["count"])
+            m2.metric("Rata-rata Kontribusi", f"{summary['avg_contribution']:.2f}")
+            m3.metric("Rata-rata Prestasi", f"{summary['avg_achievement']:.2f}")
+            if summary["unassigned"]:
+                st.warning(f"{summary['unassigned']} submission belum masuk agregat karena cluster gagal "
+                           "ditentukan. Klik 'Bangun Ulang dari CSV' untuk menyusulkan.")
+            if summary["count"]:
+                st.markdown("### Sebaran Cluster")
+                st.bar_chart({str(c): n for c, n in summary["by_cluster"].items()})
+                st.markdown("### Sebaran Minat Akademik")
+                st.bar_chart(summary["by_minat"])
+                st.markdown("### Sebaran Ekskul Utama")
+                st.bar_chart(summary["by_ekskul"])
+                st.markdown("### Keterampilan")
+                st.bar_chart(summary["skills"])
             else:
-                skills = [SKILL_LIST[i] for i in range(len(SKILL_LIST)) if st.session_state[f"skill_{i}"]]
-                profile = {
-                    "email": st.session_state.current_email,
-                    "name": name,
-                    "minat": academic,
-                    "ekskul": main_act,
-                    "skill": ", ".join(skills),
-                    "club_count": len(valid_inputs),
-                    "contribution": sum(e["contribution"] for e in valid_inputs) / len(valid_inputs),
-                    "achievement": sum(e["achievement"] for e in valid_inputs) / len(valid_inputs)
-                }
-                save_student_to_csv(profile)
-                st.session_state.student_profile = profile
-                goto("process")
+                st.info("Belum ada data untuk filter ini.")
+            st.divider()
+            col1, col2 = st.columns(2)
+            if col1.button("🔁 Bangun Ulang dari CSV", use_container_width=True):
+                with st.spinner("Menghitung ulang agregat..."):
+                    aggregates.rebuild()
+                st.rerun()
+            if col2.button("⬅️ Kembali", use_container_width=True):
+                goto("input")
                 st.rerun()
 
-    # ==================================================
-    # PROSES CLUSTERING
-    # ==================================================
-    elif st.session_state.page == "process":
-        st.title("⚙️ Proses Clustering (K-Means)")
-        profile = st.session_state.student_profile
-        if not profile:
-            goto("input")
-            st.rerun()
-        with st.spinner("Memproses data..."):
-            train_df = pd.read_csv("data/sample_data.csv")
-            vectors = [student_to_vector(row) for _, row in train_df.iterrows()]
-            vectors.append(student_to_vector(profile))
-            df_vectors = pd.DataFrame(vectors)
-            result_df, centers, sse = run_kmeans(df_vectors, k=3)
-            cluster_id = int(result_df["ClusterID"].iloc[-1])
-            centroid = centers[cluster_id] if centers.size > 0 else np.zeros(len(vectors[0]))
-            st.session_state.cluster_result = {
-                "name": profile["name"],
-                "cluster_id": cluster_id,
-                "sse": sse,
-                "profile_vector": np.array(student_to_vector(profile)),
-                "centroid": np.array(centroid)
-            }
-        st.success(f"✅ Kamu masuk ke Cluster **#{cluster_id}**")
-        if st.button("➡️ Lihat Rekomendasi", type="primary"):
-            goto("result")
-            st.rerun()
-
-    # ==================================================
-    # HASIL REKOMENDASI — DENGAN SEMUA VISUALISASI
-    # ==================================================
-    elif st.session_state.page == "result":
-        res = st.session_state.cluster_result
-        profile = st.session_state.student_profile
-        st.title("🎓 Rekomendasi Jurusan")
-        cluster_labels = {0: "Analytical", 1: "Creative", 2: "Leadership"}
-        st.subheader(f"Halo, **{res['name']}** 👋")
-        st.info(f"Kamu termasuk tipe **{cluster_labels[res['cluster_id']]}**.")
-        # Hitung skor
-        majors, scores = calculate_recommendation_scores(profile, res["cluster_id"])
-        # 🔢 Ranking
-        with st.container(border=True):
-            st.markdown("### 🔢 Ranking Rekomendasi")
-            for i, (m, s) in enumerate(zip(majors, scores), 1):
-                st.markdown(f"**{i}. {m}** — Skor: **{s:.2f}**")
-        # 📊 Bar Chart
-        if scores:
-            st.markdown("### 📊 Skor Rekomendasi")
-            fig1, ax1 = plt.subplots(figsize=(6, 4))
-            colors = plt.cm.viridis(np.linspace(0, 1, len(scores)))
-            ax1.bar(majors, scores, color=colors)
-            ax1.set_ylim(0, 1.1)
-            ax1.set_ylabel("Skor Kesesuaian")
-            plt.xticks(rotation=45, ha="right")
-            st.pyplot(fig1)
-        # 📈 Radar Chart — Profil Kompetensi
-        st.markdown("### 📈 Profil Kompetensi Anda")
-        feature_names = ["Minat", "Ekskul"] + SKILL_LIST + ["Kontribusi", "Prestasi", "Jml Klub"]
-        student_vals = res["profile_vector"]
-        centroid_vals = res["centroid"]
-        N = len(feature_names)
-        angles = np.linspace(0, 2 * np.pi, N, endpoint=False).tolist()
-        angles += angles[:1]
-        fig2, ax2 = plt.subplots(figsize=(6, 6), subplot_kw=dict(polar=True))
-        # Profil Anda
-        vals_std = student_vals.tolist()
-        vals_std += vals_std[:1]
-        ax2.plot(angles, vals_std, 'o-', linewidth=2, label='Anda')
-        ax2.fill(angles, vals_std, alpha=0.25)
-        # Rata-rata Cluster
-        vals_ideal = centroid_vals.tolist()
-        vals_ideal += vals_ideal[:1]
-        ax2.plot(angles, vals_ideal, 'o--', linewidth=2, label='Rata-rata Cluster')
-        ax2.fill(angles, vals_ideal, alpha=0.1)
-        ax2.set_thetagrids(np.degrees(angles[:-1]), feature_names)
-        ax2.legend(loc='upper right', bbox_to_anchor=(0.1, 0.1))
-        ax2.set_title("Perbandingan Profil Kompetensi", pad=20)
-        st.pyplot(fig2)
-        # ℹ️ Detail Teknis
-        with st.expander("ℹ️ Detail Clustering"):
-            st.metric("Cluster ID", res["cluster_id"])
-            st.metric("Nilai SSE", f"{res['sse']:.3f}")
-        st.divider()
-        if st.button("🔄 Isi Ulang Profil", use_container_width=True):
-            goto("input")
-            st.rerun()
\ No newline at end of file
+# Setelah halaman pertama tampil, muat modul berat & indeks profil di latar supaya halaman berikutnya tidak menunggu
+startup.warm_up_in_background()
+get_profile_index().refresh_in_background()
@@ -1,10 +1,24 @@
 # models/kmeans_model.py
 
+import hashlib
+import json
+import os
+import tempfile
+
 import pandas as pd
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
 import numpy as np
+from utils.data_processor import encode_frame
+from utils.tracing import traced
+
+TRAIN_PATH = "data/sample_data.csv"
+MODEL_PATH = "data/kmeans_model.json"
+K_SELECTION_PATH = "data/k_selection.json"
+MODEL_FORMAT = 2
+CLUSTER_LABELS = {0: "Analytical", 1: "Creative", 2: "Leadership"}
 
+@traced("kmeans.run_kmeans")
 def run_kmeans(df_features: pd.DataFrame, k: int = 3):
     if len(df_features) < k:
         # Jika data kurang dari k, gunakan k = jumlah data
@@ -25,4 +39,195 @@ def run_kmeans(df_features: pd.DataFrame, k: int = 3):
     
     result_df = df_features.copy()
     result_df['ClusterID'] = labels
-    return result_df, kmeans.cluster_centers_, kmeans.inertia_
\ No newline at end of file
+    return result_df, kmeans.cluster_centers_, kmeans.inertia_
+
+# ======================================================
+# MODEL TERSIMPAN (FIT SEKALI, PREDIKSI BERKALI-KALI)
+# ======================================================
+def hash_training_data(path: str = TRAIN_PATH) -> str:
+    """Hash isi file data latih, dipakai untuk mendeteksi perubahan data."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+@traced("kmeans.fit_model")
+def fit_model(df_features: pd.DataFrame, k: int = 3, data_hash: str = "") -> dict:
+    """Fit scaler + K-Means dan kembalikan artefak model yang bisa disimpan."""
+    k = min(k, len(df_features))
+    if k == 0:
+        raise ValueError("Tidak ada data untuk dikelompokkan.")
+    scaler = StandardScaler()
+    scaled_data = scaler.fit_transform(df_features)
+    kmeans = KMeans(n_clusters=k, random_state=42, n_init='auto')
+    kmeans.fit(scaled_data)
+    return {
+        "format": MODEL_FORMAT,
+        "data_hash": data_hash,
+        "k": k,
+        "n_samples": len(df_features),
+        "scaler_mean": scaler.mean_.tolist(),
+        "scaler_scale": scaler.scale_.tolist(),
+        # Varians asli (0 untuk fitur konstan; scale_ di sana diganti 1), untuk statistik clusterer online
+        "scaler_var": scaler.var_.tolist(),
+        "centroids": kmeans.cluster_centers_.tolist(),
+        "labels": {str(i): CLUSTER_LABELS.get(i, f"Cluster {i}") for i in range(k)},
+        "sse": float(kmeans.inertia_),
+    }
+
+def _write_json(data: dict, path: str):
+    # File sementara unik lalu rename: pembaca tidak melihat file setengah jadi, dan beberapa proses
+    # yang menulis bersamaan tidak saling menimpa file sementara yang sama
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=4)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _read_json(path: str):
+    """Isi file JSON, atau None jika tidak ada / tidak terbaca (artefak dibuat ulang oleh pemanggil)."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+def save_model(model: dict, path: str = MODEL_PATH):
+    _write_json(model, path)
+
+def load_model(path: str = MODEL_PATH):
+    model = _read_json(path)
+    if model is None or model.get("format") != MODEL_FORMAT:
+        return None
+    try:
+        model["scaler_mean"] = np.asarray(model["scaler_mean"], dtype=float)
+        model["scaler_scale"] = np.asarray(model["scaler_scale"], dtype=float)
+        model["scaler_var"] = np.asarray(model["scaler_var"], dtype=float)
+        model["centroids"] = np.asarray(model["centroids"], dtype=float)
+    except (KeyError, TypeError, ValueError):
+        return None
+    return model
+
+@traced("kmeans.load_or_fit_model")
+def load_or_fit_model(train_path: str = TRAIN_PATH, model_path: str = MODEL_PATH, k: int = 3) -> dict:
+    """Muat model dari disk; fit ulang hanya jika hash data latih berubah."""
+    data_hash = hash_training_data(train_path)
+    model = load_model(model_path)
+    if model is not None and model["data_hash"] == data_hash and model["k"] == min(k, model["n_samples"]):
+        return model
+    train_df = pd.read_csv(train_path)
+    vectors = pd.DataFrame(encode_frame(train_df))
+    save_model(fit_model(vectors, k=k, data_hash=data_hash), model_path)
+    return load_model(model_path)
+
+@traced("kmeans.predict_clusters")
+def predict_clusters(model: dict, X):
+    """Versi batch: cluster terdekat & jarak kuadrat untuk setiap baris X."""
+    scaled = (np.asarray(X, dtype=float) - model["scaler_mean"]) / model["scaler_scale"]
+    # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2, tanpa membuat array N x k x fitur
+    centroids = model["centroids"]
+    distances = (scaled ** 2).sum(axis=1)[:, None] - 2 * scaled @ centroids.T + (centroids ** 2).sum(axis=1)
+    labels = distances.argmin(axis=1)
+    return labels, np.maximum(distances[np.arange(len(labels)), labels], 0.0)
+
+@traced("kmeans.predict_cluster")
+def predict_cluster(model: dict, vector):
+    """Standarisasi satu vektor lalu cari centroid terdekat."""
+    scaled = (np.asarray(vector, dtype=float) - model["scaler_mean"]) / model["scaler_scale"]
+    distances = ((model["centroids"] - scaled) ** 2).sum(axis=1)
+    cluster_id = int(distances.argmin())
+    return cluster_id, model["centroids"][cluster_id]
+
+# ======================================================
+# PEMILIHAN K OTOMATIS (ELBOW + SILHOUETTE BERSAMPEL)
+# ======================================================
+def _evaluate_k(scaled_data, k: int, sample_size: int, random_state: int) -> dict:
+    from sklearn.metrics import silhouette_score
+
+    kmeans = KMeans(n_clusters=k, random_state=42, n_init='auto')
+    labels = kmeans.fit_predict(scaled_data)
+    try:
+        # Silhouette penuh O(n^2): cukup dihitung pada sampel acak berukuran tetap
+        sample = min(sample_size, len(scaled_data))
+        silhouette = float(silhouette_score(scaled_data, labels, sample_size=sample, random_state=random_state))
+    except ValueError:
+        # Sampel hanya berisi satu cluster
+        silhouette = float("nan")
+    return {"k": k, "inertia": float(kmeans.inertia_), "silhouette": silhouette}
+
+def _elbow_k(scores: list):
+    # Titik dengan jarak terjauh dari garis lurus antara inertia k terkecil dan terbesar
+    if len(scores) < 3:
+        return scores[0]["k"] if scores else None
+    ks = np.array([s["k"] for s in scores], dtype=float)
+    inertia = np.array([s["inertia"] for s in scores])
+    x = (ks - ks[0]) / (ks[-1] - ks[0])
+    y = (inertia - inertia[-1]) / max(inertia[0] - inertia[-1], 1e-12)
+    return int(ks[np.argmax(np.abs(1 - x - y))])
+
+@traced("kmeans.select_k")
+def select_k(df_features, k_values=range(2, 13), sample_size: int = 2000, n_jobs: int = -1,
+             random_state: int = 42) -> dict:
+    """Sweep beberapa nilai k secara paralel dan pilih k dengan silhouette tertinggi."""
+    from joblib import Parallel, delayed
+
+    scaled_data = StandardScaler().fit_transform(df_features)
+    candidates = [k for k in k_values if 2 <= k < len(scaled_data)]
+    if not candidates:
+        raise ValueError("Data terlalu sedikit untuk memilih jumlah cluster.")
+    scores = Parallel(n_jobs=n_jobs)(
+        delayed(_evaluate_k)(scaled_data, k, sample_size, random_state) for k in candidates
+    )
+    valid = [s for s in scores if not np.isnan(s["silhouette"])]
+    best = max(valid, key=lambda s: s["silhouette"]) if valid else scores[0]
+    return {
+        "chosen_k": best["k"],
+        "elbow_k": _elbow_k(scores),
+        "k_values": candidates,
+        "sample_size": sample_size,
+        "n_samples": len(scaled_data),
+        "scores": scores,
+    }
+
+def load_or_select_k(train_path: str = TRAIN_PATH, report_path: str = K_SELECTION_PATH,
+                     k_values=range(2, 13), sample_size: int = 2000, n_jobs: int = -1) -> dict:
+    """Laporan pemilihan k, di-cache terhadap hash data latih dan parameter sweep."""
+    data_hash = hash_training_data(train_path)
+    k_values = list(k_values)
+    report = _read_json(report_path)
+    if (report is not None and report.get("data_hash") == data_hash and report.get("requested_k") == k_values
+            and report.get("sample_size") == sample_size):
+        return report
+    vectors = pd.DataFrame(encode_frame(pd.read_csv(train_path)))
+    report = select_k(vectors, k_values=k_values, sample_size=sample_size, n_jobs=n_jobs)
+    report["data_hash"] = data_hash
+    report["requested_k"] = k_values
+    _write_json(report, report_path)
+    return report
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fit model K-Means secara offline.")
+    parser.add_argument("--select-k", action="store_true", help="Sweep k dan tampilkan laporan elbow/silhouette")
+    parser.add_argument("--k-min", type=int, default=2)
+    parser.add_argument("--k-max", type=int, default=12)
+    parser.add_argument("--sample-size", type=int, default=2000)
+    args = parser.parse_args()
+    if args.select_k:
+        report = load_or_select_k(k_values=range(args.k_min, args.k_max + 1), sample_size=args.sample_size)
+        for score in report["scores"]:
+            print(f"k={score['k']:>2}  inertia={score['inertia']:12.3f}  silhouette={score['silhouette']:.4f}")
+        print(f"k terpilih (silhouette): {report['chosen_k']} | elbow: {report['elbow_k']}")
+    else:
+        # Fit offline: python -m models.kmeans_model
+        fitted = load_or_fit_model()
+        print(f"Model k={fitted['k']} (data {fitted['data_hash'][:12]}) tersimpan di {MODEL_PATH}")
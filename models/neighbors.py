@@ -0,0 +1,171 @@
+# models/neighbors.py
+# "Siswa yang mirip denganmu": KD-tree atas vektor fitur terstandarisasi dari students.csv.
+import logging
+import os
+import pickle
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree
+
+from models.kmeans_model import predict_clusters
+from models.recommender import rank_majors
+from utils.data_processor import encode_frame
+from utils.storage import CSV_PATH, CsvTail
+from utils.tracing import traced
+
+INDEX_PATH = "data/neighbors.pkl"
+INDEX_FORMAT = 4
+MIN_REBUILD = 1000      # baris di buffer delta sebelum tree dibangun ulang ...
+REBUILD_RATIO = 0.1     # ... atau 10% dari ukuran tree, mana yang lebih besar
+
+logger = logging.getLogger(__name__)
+
+class NeighborIndex:
+    """KD-tree statis + buffer delta kecil (brute force) untuk baris baru.
+
+    Baris baru dibaca dari ekor students.csv (CsvTail), jadi CSV tetap sumber kebenaran.
+    Siswa yang mengisi ulang profil hanya diwakili baris terbarunya.
+    """
+
+    def __init__(self, model: dict, csv_path: str = CSV_PATH):
+        self.model_hash = model["data_hash"]
+        self.mean = model["scaler_mean"]
+        self.scale = model["scaler_scale"]
+        self.model = model
+        self.csv_path = csv_path
+        self.tail = CsvTail(csv_path)
+        self.tree = None
+        self.base = np.empty((0, len(self.mean)))
+        self.delta = np.empty((0, len(self.mean)))
+        self.meta = pd.DataFrame(columns=["email", "name", "cluster_id", "major"])
+        self.latest = {}                        # email -> baris terbaru di meta
+        self.superseded = np.zeros(0, dtype=bool)  # per baris meta: sudah digantikan versi lebih baru
+        self._lock = threading.Lock()
+
+    def _standardize(self, X):
+        return (np.asarray(X, dtype=float) - self.mean) / self.scale
+
+    def _metadata(self, df: pd.DataFrame, X) -> pd.DataFrame:
+        clusters, _ = predict_clusters(self.model, X)
+        majors, _ = rank_majors(X, clusters)
+        return pd.DataFrame({
+            "email": df["email"].to_numpy() if "email" in df else "",
+            "name": df["name"].to_numpy() if "name" in df else "",
+            "cluster_id": clusters,
+            "major": majors[:, 0] if majors.shape[1] else "",
+        })
+
+    @traced("neighbors.refresh")
+    def refresh(self):
+        """Masukkan baris baru dari ekor CSV; bangun ulang tree jika delta sudah besar."""
+        with self._lock:
+            new_rows, reset = self.tail.read()
+            if reset:
+                self.tree, self.base = None, np.empty((0, len(self.mean)))
+                self.delta = np.empty((0, len(self.mean)))
+                self.meta = self.meta.iloc[:0]
+                self.latest, self.superseded = {}, np.zeros(0, dtype=bool)
+            if len(new_rows):
+                X = encode_frame(new_rows)
+                self.delta = np.vstack([self.delta, self._standardize(X)])
+                self._mark_superseded(new_rows)
+                self.meta = pd.concat([self.meta, self._metadata(new_rows, X)], ignore_index=True)
+            if len(self.delta) > max(MIN_REBUILD, REBUILD_RATIO * len(self.base)) or (
+                    self.tree is None and len(self.delta)):
+                self._rebuild()
+                return True
+        return False
+
+    def _mark_superseded(self, new_rows: pd.DataFrame):
+        start = len(self.superseded)
+        self.superseded = np.concatenate([self.superseded, np.zeros(len(new_rows), dtype=bool)])
+        if "email" not in new_rows:
+            return
+        for row, email in enumerate(new_rows["email"].to_numpy(), start=start):
+            if not isinstance(email, str) or not email:
+                continue  # tanpa email tidak bisa dikenali sebagai siswa yang sama
+            previous = self.latest.get(email)
+            if previous is not None:
+                self.superseded[previous] = True
+            self.latest[email] = row
+
+    def _rebuild(self):
+        self.base = np.vstack([self.base, self.delta])
+        self.delta = np.empty((0, len(self.mean)))
+        self.tree = KDTree(self.base)
+
+    @traced("neighbors.query")
+    def query(self, vector, k: int = 5, exclude_email: str = None) -> pd.DataFrame:
+        """k siswa terdekat (jarak di ruang terstandarisasi), dengan cluster & jurusan teratas mereka."""
+        z = self._standardize([vector])
+        with self._lock:
+            emails = self.meta["email"].to_numpy()
+            delta_dist = np.sqrt(((self.delta - z) ** 2).sum(axis=1))
+            delta_idx = len(self.base) + np.arange(len(self.delta))
+            # Baris lama & email sendiri dibuang setelah query; perbesar kandidat sampai tersisa k hasil
+            fetch = 2 * k
+            while True:
+                dist, idx = delta_dist, delta_idx
+                if self.tree is not None and len(self.base):
+                    d, i = self.tree.query(z, k=min(fetch, len(self.base)))
+                    dist, idx = np.concatenate([d[0], dist]), np.concatenate([i[0], idx])
+                keep = ~self.superseded[idx]
+                if exclude_email:
+                    keep &= emails[idx] != exclude_email
+                if keep.sum() >= k or fetch >= len(self.base):
+                    break
+                fetch *= 2
+            dist, idx = dist[keep], idx[keep]
+            order = np.argsort(dist, kind="stable")[:k]
+            result = self.meta.iloc[idx[order]].assign(distance=dist[order])
+        return result.reset_index(drop=True)
+
+    def save(self, path: str = INDEX_PATH):
+        with self._lock:
+            state = {k: v for k, v in self.__dict__.items() if k not in ("_lock", "model")}
+        state["format"] = INDEX_FORMAT
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # File sementara unik: setiap proses worker menyimpan index yang sama
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @classmethod
+    def load(cls, model: dict, path: str = INDEX_PATH, csv_path: str = CSV_PATH):
+        """Muat index dari disk jika dibangun untuk model & CSV yang sama; jika tidak, index kosong."""
+        index = cls(model, csv_path)
+        if os.path.exists(path):
+            try:
+                with open(path, "rb") as f:
+                    state = pickle.load(f)
+            except Exception:
+                # File rusak/terpotong atau dibuat versi sklearn lain: bangun ulang dari CSV
+                logger.warning("Index tetangga %s tidak bisa dimuat; dibangun ulang", path, exc_info=True)
+                return index
+            if isinstance(state, dict) and (state.get("format") == INDEX_FORMAT and state["model_hash"] == model["data_hash"]
+                    and os.path.abspath(state["csv_path"]) == os.path.abspath(csv_path)):
+                state.pop("format")
+                index.__dict__.update(state)
+        return index
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def get_neighbor_index(model: dict, path: str = INDEX_PATH, csv_path: str = CSV_PATH) -> NeighborIndex:
+    """Index bersama per proses untuk model ini; diperbarui dari CSV pada setiap panggilan."""
+    key = (model["data_hash"], os.path.abspath(csv_path))
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = NeighborIndex.load(model, path, csv_path)
+    if index.refresh():
+        index.save(path)
+    return index
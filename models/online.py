@@ -0,0 +1,196 @@
+# models/online.py
+# Re-clustering inkremental di thread latar: centroid belajar dari submission baru di students.csv.
+# Handler request cukup membaca `clusterer.current` (pertukaran referensi atomik, tanpa lock).
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import linear_sum_assignment
+
+from models.kmeans_model import TRAIN_PATH, fit_model, hash_training_data, predict_clusters
+from utils.compact import load_packed_csv
+from utils.data_processor import encode_frame
+from utils.storage import CSV_PATH, CsvTail, file_lock
+from utils.tracing import traced
+
+POLL_INTERVAL = 5.0      # detik antar pengecekan submission baru
+DRIFT_THRESHOLD = 0.15   # fraksi penugasan cluster yang berubah sebelum refit penuh
+DRIFT_DECAY = 0.9        # bobot rata-rata bergerak drift
+
+logger = logging.getLogger(__name__)
+
+class OnlineClusterer:
+    def __init__(self, base_model: dict, csv_path: str = CSV_PATH, train_path: str = TRAIN_PATH,
+                 poll_interval: float = POLL_INTERVAL, drift_threshold: float = DRIFT_THRESHOLD):
+        self.csv_path = csv_path
+        self.train_path = train_path
+        self.poll_interval = poll_interval
+        self.drift_threshold = drift_threshold
+        self.tail = CsvTail(csv_path)
+        self.sequence = 0
+        self.refits = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._train_key = self._training_key()
+        self._reset_from(base_model)
+        self.current = self._publish()
+
+    def _reset_from(self, model: dict):
+        """Jadikan `model` titik awal: statistik scaler & centroid di ruang asli."""
+        self.base_model = model
+        self.k = len(model["centroids"])
+        self.n = float(model["n_samples"])
+        self.mean = np.array(model["scaler_mean"], dtype=float)
+        # Dari varians, bukan scale: fitur konstan punya scale 1 tetapi varians 0
+        self.m2 = np.array(model["scaler_var"], dtype=float) * self.n
+        self.centroids = model["centroids"] * model["scaler_scale"] + model["scaler_mean"]
+        self.counts = np.full(self.k, max(self.n / max(self.k, 1), 1.0))
+        self.drift = 0.0
+
+    def _scale(self):
+        scale = np.sqrt(self.m2 / max(self.n, 1.0))
+        # Sama seperti StandardScaler: fitur tanpa variasi tidak diskalakan
+        return np.where(scale > 0, scale, 1.0)
+
+    def _publish(self) -> dict:
+        scale = self._scale()
+        model = dict(self.base_model)
+        model.update({
+            "scaler_mean": self.mean.copy(),
+            "scaler_scale": scale,
+            "scaler_var": self.m2 / max(self.n, 1.0),
+            "centroids": (self.centroids - self.mean) / scale,
+            "n_samples": int(self.n),
+            "sequence": self.sequence,
+            "version": f"{self.base_model['data_hash'][:12]}-r{self.refits}-s{self.sequence}",
+            "drift": self.drift,
+        })
+        return model
+
+    @traced("online.partial_fit")
+    def partial_fit(self, X):
+        """Update mini-batch: statistik scaler (Welford) lalu centroid, kemudian publikasikan versi baru."""
+        X = np.asarray(X, dtype=float)
+        if not len(X):
+            return self.current
+        # Statistik scaler gabungan (algoritma paralel Chan/Welford)
+        n_b = len(X)
+        mean_b = X.mean(axis=0)
+        m2_b = ((X - mean_b) ** 2).sum(axis=0)
+        delta = mean_b - self.mean
+        total = self.n + n_b
+        self.mean = self.mean + delta * n_b / total
+        self.m2 = self.m2 + m2_b + delta ** 2 * self.n * n_b / total
+        self.n = total
+
+        # Mini-batch K-Means: setiap centroid bergeser ke rata-rata titik barunya, dengan learning rate 1/count
+        draft = self._publish()
+        labels, _ = predict_clusters(draft, X)
+        for c in range(self.k):
+            members = X[labels == c]
+            if len(members):
+                self.counts[c] += len(members)
+                self.centroids[c] += (members.sum(axis=0) - len(members) * self.centroids[c]) / self.counts[c]
+
+        # Drift: seberapa banyak penugasan berbeda dari model hasil fit penuh terakhir
+        self.sequence += 1
+        updated = self._publish()
+        base_labels, _ = predict_clusters(self.base_model, X)
+        new_labels, _ = predict_clusters(updated, X)
+        batch_drift = float((base_labels != new_labels).mean())
+        self.drift = DRIFT_DECAY * self.drift + (1 - DRIFT_DECAY) * batch_drift
+        updated["drift"] = self.drift
+        self.current = updated  # pertukaran referensi atomik
+        if self.drift > self.drift_threshold:
+            self.full_refit()
+        return self.current
+
+    @traced("online.full_refit")
+    def full_refit(self):
+        """Fit ulang penuh (data latih + semua submission), dengan ID cluster diselaraskan ke versi lama."""
+        X = encode_frame(pd.read_csv(self.train_path))
+        # Submission dibaca dalam bentuk ringkas: kolom teks tidak pernah dimuat sekaligus. Di bawah lock CSV,
+        # tail dimajukan tepat ke akhir data yang dibaca supaya tidak ada baris yang dipelajari dua kali
+        with file_lock(self.csv_path):
+            students = load_packed_csv(self.csv_path)
+            self.tail.skip_to_end()
+        if len(students):
+            X = np.vstack([X, encode_frame(students)])
+        model = fit_model(pd.DataFrame(X), k=self.k, data_hash=self.base_model["data_hash"])
+        for key in ("scaler_mean", "scaler_scale", "scaler_var", "centroids"):
+            model[key] = np.asarray(model[key], dtype=float)
+        # Hungarian matching supaya cluster 0/1/2 tetap berarti Analytical/Creative/Leadership
+        new_raw = model["centroids"] * model["scaler_scale"] + model["scaler_mean"]
+        cost = ((self.centroids[:, None, :] - new_raw[None, :, :]) ** 2).sum(axis=2)
+        _, order = linear_sum_assignment(cost)
+        model["centroids"] = model["centroids"][order]
+        model["labels"] = self.base_model["labels"]
+        self.refits += 1
+        self.sequence += 1
+        self._reset_from(model)
+        self.current = self._publish()
+        return self.current
+
+    def _training_key(self):
+        try:
+            stat = os.stat(self.train_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _check_training_data(self) -> bool:
+        """Data latih berubah: fit ulang penuh di thread latar (request tidak pernah memeriksa file ini)."""
+        key = self._training_key()
+        if key == self._train_key:
+            return False
+        self._train_key = key
+        data_hash = hash_training_data(self.train_path)
+        if data_hash == self.base_model["data_hash"]:
+            return False
+        self.base_model = dict(self.base_model, data_hash=data_hash)
+        self.full_refit()
+        return True
+
+    def step(self):
+        if self._check_training_data():
+            return self.current
+        new_rows, reset = self.tail.read()
+        if reset:
+            # CSV ditulis ulang: sebagian baris mungkin sudah dipelajari, jadi fit ulang dari nol
+            self.full_refit()
+            return self.current
+        if len(new_rows):
+            return self.partial_fit(encode_frame(new_rows))
+        return self.current
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="online-clusterer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.step()
+            except Exception:  # model lama tetap dipakai
+                logger.exception("Re-clustering gagal; model versi %s tetap dipakai", self.current.get("version"))
+            self._stop.wait(self.poll_interval)
+
+_clusterer = None
+_clusterer_lock = threading.Lock()
+
+def get_online_clusterer(base_model: dict) -> OnlineClusterer:
+    """Clusterer latar per proses (dimulai saat pertama dipanggil)."""
+    global _clusterer
+    with _clusterer_lock:
+        if _clusterer is None or _clusterer.base_model["data_hash"] != base_model["data_hash"]:
+            if _clusterer is not None:
+                _clusterer.stop()
+            _clusterer = OnlineClusterer(base_model).start()
+        return _clusterer
@@ -0,0 +1,104 @@
+# models/recommender.py
+
+import numpy as np
+
+from config import ACADEMIC_CODES, ACTIVITY_CODES, SKILL_LIST
+from utils.data_processor import student_to_vector
+from utils.tracing import traced
+
+MINAT_WEIGHT = 0.4
+EKSKUL_WEIGHT = 0.2
+SKILL_WEIGHT = 0.4
+
+# Aturan per cluster: jurusan, minat & ekskul yang cocok, serta skill yang relevan
+RULES = {
+    0: {  # Analytical
+        "majors": ["Ilmu Komputer", "Matematika", "Statistika"],
+        "minat": ["IPA"],
+        "ekskul": ["Robotik", "Debat", "Jurnalistik"],
+        "skills": ["Publik Speaking", "Analisis Data", "Problem Solving", "Ketekunan"],
+    },
+    1: {  # Creative
+        "majors": ["DKV", "Sastra", "Film"],
+        "minat": ["Bahasa", "IPS"],
+        "ekskul": ["Seni Musik", "Seni Rupa", "Teater", "Film"],
+        "skills": ["Desain", "Kreativitas", "Menulis", "Publik Speaking"],
+    },
+    2: {  # Leadership
+        "majors": ["Manajemen", "Komunikasi", "Hubungan Internasional"],
+        "minat": ["IPS", "Bahasa"],
+        "ekskul": ["OSIS", "Pramuka", "Paskibra", "PMR"],
+        "skills": ["Leadership", "Negosiasi", "Kolaborasi", "Publik Speaking"],
+    },
+}
+
+def compile_rules(rules: dict = RULES) -> dict:
+    """Ubah RULES menjadi tabel NumPy (satu baris per jurusan)."""
+    majors, clusters, minat_w, ekskul_w, skill_mask = [], [], [], [], []
+    for cluster_id, rule in sorted(rules.items()):
+        # Ekskul di luar ACTIVITY_CODES (mis. "Film", "Paskibra") tidak punya kode, jadi tidak pernah cocok
+        minat_row = np.zeros(max(ACADEMIC_CODES.values()) + 1)
+        minat_row[[ACADEMIC_CODES[m] for m in rule["minat"] if m in ACADEMIC_CODES]] = MINAT_WEIGHT
+        ekskul_row = np.zeros(max(ACTIVITY_CODES.values()) + 1)
+        ekskul_row[[ACTIVITY_CODES[e] for e in rule["ekskul"] if e in ACTIVITY_CODES]] = EKSKUL_WEIGHT
+        mask_row = [1.0 if s in rule["skills"] else 0.0 for s in SKILL_LIST]
+        for major in rule["majors"]:
+            majors.append(major)
+            clusters.append(cluster_id)
+            minat_w.append(minat_row)
+            ekskul_w.append(ekskul_row)
+            skill_mask.append(mask_row)
+    skill_mask = np.array(skill_mask, dtype=float).reshape(len(majors), len(SKILL_LIST))
+    return {
+        "majors": np.array(majors, dtype=object),
+        "clusters": np.array(clusters),
+        "minat_w": np.array(minat_w).reshape(len(majors), -1),
+        "ekskul_w": np.array(ekskul_w).reshape(len(majors), -1),
+        "skill_mask": skill_mask,
+        "relevant": np.maximum(skill_mask.sum(axis=1), 1),
+        "width": max((len(r["majors"]) for r in rules.values()), default=0),
+    }
+
+TABLE = compile_rules()
+
+def score_matrix(X, table: dict = TABLE) -> np.ndarray:
+    """Skor semua siswa (baris X dari encode_frame) terhadap semua jurusan: N x jumlah jurusan."""
+    X = np.asarray(X, dtype=float)
+    minat = X[:, 0].astype(int)
+    ekskul = X[:, 1].astype(int)
+    skills = X[:, 2:2 + len(SKILL_LIST)]
+    # Kode di luar tabel dianggap 0 (tidak cocok dengan aturan mana pun)
+    minat = np.where((minat >= 0) & (minat < table["minat_w"].shape[1]), minat, 0)
+    ekskul = np.where((ekskul >= 0) & (ekskul < table["ekskul_w"].shape[1]), ekskul, 0)
+    # Urutan penjumlahan sama dengan versi per-siswa agar hasil float identik
+    scores = table["minat_w"].T[minat] + table["ekskul_w"].T[ekskul]
+    scores = scores + SKILL_WEIGHT * (skills @ table["skill_mask"].T) / table["relevant"]
+    return np.minimum(scores, 1.0)
+
+@traced("recommender.rank_majors")
+def rank_majors(X, cluster_ids, table: dict = TABLE):
+    """Ranking jurusan per siswa sesuai cluster-nya.
+
+    Mengembalikan (nama jurusan, skor), masing-masing N x lebar; slot kosong berisi "" dan NaN.
+    """
+    cluster_ids = np.asarray(cluster_ids)
+    scores = score_matrix(X, table)
+    n, width = len(cluster_ids), table["width"]
+    ranked_majors = np.full((n, width), "", dtype=object)
+    ranked_scores = np.full((n, width), np.nan)
+    for cluster_id in np.unique(cluster_ids):
+        cols = np.flatnonzero(table["clusters"] == cluster_id)
+        if cols.size == 0:
+            continue
+        rows = np.flatnonzero(cluster_ids == cluster_id)
+        sub = scores[np.ix_(rows, cols)]
+        order = np.argsort(-sub, axis=1, kind="stable")
+        ranked_majors[rows, :cols.size] = table["majors"][cols][order]
+        ranked_scores[rows, :cols.size] = np.take_along_axis(sub, order, axis=1)
+    return ranked_majors, ranked_scores
+
+@traced("recommender.calculate_recommendation_scores")
+def calculate_recommendation_scores(profile, cluster_id):
+    majors, scores = rank_majors([student_to_vector(profile)], [cluster_id])
+    valid = majors[0] != ""
+    return majors[0][valid].tolist(), scores[0][valid].tolist()
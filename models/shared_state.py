@@ -0,0 +1,221 @@
+# models/shared_state.py
+# State model bersama untuk beberapa proses Streamlit di balik load balancer.
+# Satu proses builder menulis matriks latih ter-encode, statistik scaler, dan centroid sebagai file .npy;
+# worker memetakannya read-only (np.load mmap_mode="r", tanpa salinan) dan memuat ulang saat versi berubah.
+#   python -m models.shared_state --dir /dev/shm/sppk   -> publikasikan sekali dari data latih
+import argparse
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+
+from utils.tracing import traced
+
+SHARED_DIR = "data/shared_model"
+MANIFEST_NAME = "current.json"
+STATE_FORMAT = 1
+MODEL_ARRAYS = ("scaler_mean", "scaler_scale", "centroids")
+KEEP_VERSIONS = 3        # versi lama tetap ada sebentar untuk worker yang sedang memuat
+WAIT_TIMEOUT = 60.0      # detik worker menunggu publikasi pertama dari builder
+PUBLISH_INTERVAL = 5.0   # detik antar pengecekan versi baru di builder
+
+logger = logging.getLogger(__name__)
+
+def model_version(model: dict) -> str:
+    """Label versi model (versi clusterer online, atau hash data latih); lihat juga model_fingerprint."""
+    return model.get("version", model["data_hash"])
+
+def _safe_name(version: str) -> str:
+    return "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in version)
+
+def _save_array(path: str, array):
+    # Tulis ke file sementara lalu rename; file yang sedang di-mmap worker tidak pernah ditimpa
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, np.ascontiguousarray(array, dtype=np.float64))
+    os.replace(tmp_path, path)
+
+def _prune(directory: str, manifest: dict):
+    """Hapus versi lama; di POSIX worker yang masih memetakan file lama tidak terganggu."""
+    model_dirs = sorted(
+        (e for e in os.scandir(directory) if e.is_dir() and e.name.startswith("model-")),
+        key=lambda e: e.stat().st_mtime, reverse=True
+    )
+    for entry in model_dirs[KEEP_VERSIONS:]:
+        if entry.name != manifest["model_dir"]:
+            shutil.rmtree(entry.path, ignore_errors=True)
+    for entry in os.scandir(directory):
+        if entry.name.startswith("train-") and entry.name != manifest["matrix"]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass  # Windows: masih dipetakan proses lain
+
+@traced("shared_state.publish")
+def publish(model: dict, X, directory: str = SHARED_DIR) -> dict:
+    """Tulis model + matriks latih sebagai .npy lalu ganti manifest secara atomik (hanya builder)."""
+    os.makedirs(directory, exist_ok=True)
+    version = model_version(model)
+    # Matriks latih hanya berubah bersama data latih; versi online cukup menulis array model yang kecil
+    matrix_name = f"train-{model['data_hash'][:16]}.npy"
+    if not os.path.exists(os.path.join(directory, matrix_name)):
+        _save_array(os.path.join(directory, matrix_name), X)
+    model_dir = f"model-{_safe_name(version)}"
+    os.makedirs(os.path.join(directory, model_dir), exist_ok=True)
+    for key in MODEL_ARRAYS:
+        _save_array(os.path.join(directory, model_dir, f"{key}.npy"), model[key])
+    manifest = {
+        "format": STATE_FORMAT,
+        "version": version,
+        "data_hash": model["data_hash"],
+        "k": model["k"],
+        "n_samples": model["n_samples"],
+        "labels": model["labels"],
+        "sse": model["sse"],
+        "matrix": matrix_name,
+        "model_dir": model_dir,
+        "published_at": time.time(),
+    }
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=4)
+    os.replace(tmp_path, manifest_path)
+    _prune(directory, manifest)
+    return manifest
+
+class SharedModelState:
+    """Pembaca state bersama (worker): array di-mmap read-only, dimuat ulang saat manifest berganti."""
+
+    def __init__(self, directory: str = SHARED_DIR, wait_timeout: float = WAIT_TIMEOUT):
+        self.directory = directory
+        self.wait_timeout = wait_timeout
+        self.manifest_path = os.path.join(directory, MANIFEST_NAME)
+        self._key = None
+        self._state = None
+        self._lock = threading.Lock()
+
+    def _manifest_key(self):
+        try:
+            stat = os.stat(self.manifest_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _wait_for_manifest(self):
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            key = self._manifest_key()
+            if key is not None:
+                return key
+            if time.monotonic() >= deadline:
+                raise RuntimeError(
+                    f"Model bersama belum dipublikasikan di {self.directory}; jalankan proses builder dulu."
+                )
+            time.sleep(0.5)
+
+    def _load(self) -> dict:
+        with open(self.manifest_path, "r") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != STATE_FORMAT:
+            raise RuntimeError(f"Format state bersama tidak dikenal di {self.directory}.")
+        if self._state is not None and self._state["model"]["version"] == manifest["version"]:
+            return self._state
+        model_dir = os.path.join(self.directory, manifest["model_dir"])
+        model = {key: manifest[key] for key in ("data_hash", "k", "n_samples", "labels", "sse", "version")}
+        for key in MODEL_ARRAYS:
+            model[key] = np.load(os.path.join(model_dir, f"{key}.npy"), mmap_mode="r")
+        matrix = np.load(os.path.join(self.directory, manifest["matrix"]), mmap_mode="r")
+        return {"model": model, "matrix": matrix}
+
+    @traced("shared_state.get")
+    def get(self) -> dict:
+        key = self._manifest_key()
+        if key is not None and key == self._key:
+            return self._state
+        with self._lock:
+            key = self._wait_for_manifest()
+            if key == self._key:
+                return self._state
+            try:
+                state = self._load()
+            except FileNotFoundError:
+                # Builder baru saja mengganti versi; manifest terbaru pasti menunjuk file yang ada
+                key = self._wait_for_manifest()
+                state = self._load()
+            self._state, self._key = state, key
+            return state
+
+    def model(self) -> dict:
+        return self.get()["model"]
+
+    def matrix(self):
+        return self.get()["matrix"]
+
+class SharedModelPublisher:
+    """Sisi builder: publikasikan setiap versi model baru, juga dari thread latar."""
+
+    def __init__(self, directory: str = SHARED_DIR, interval: float = PUBLISH_INTERVAL):
+        self.directory = directory
+        self.interval = interval
+        self.published_version = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def publish_if_changed(self, model: dict, matrix_loader) -> bool:
+        if model_version(model) == self.published_version:
+            return False
+        with self._lock:
+            if model_version(model) == self.published_version:
+                return False
+            publish(model, matrix_loader(), self.directory)
+            self.published_version = model_version(model)
+        return True
+
+    def start(self, model_source, matrix_loader):
+        """Cek `model_source()` berkala supaya versi online terbit tanpa menunggu request."""
+        if self._thread is not None:
+            return self
+
+        def run():
+            while True:
+                time.sleep(self.interval)
+                try:
+                    self.publish_if_changed(model_source(), matrix_loader)
+                except Exception:  # versi lama tetap dipakai worker
+                    logger.exception("Publikasi model bersama ke %s gagal", self.directory)
+
+        self._thread = threading.Thread(target=run, name="shared-model-publisher", daemon=True)
+        self._thread.start()
+        return self
+
+_readers = {}
+_publishers = {}
+_registry_lock = threading.Lock()
+
+def get_shared_state(directory: str = SHARED_DIR) -> SharedModelState:
+    with _registry_lock:
+        return _readers.setdefault(os.path.abspath(directory), SharedModelState(directory))
+
+def get_publisher(directory: str = SHARED_DIR) -> SharedModelPublisher:
+    with _registry_lock:
+        return _publishers.setdefault(os.path.abspath(directory), SharedModelPublisher(directory))
+
+if __name__ == "__main__":
+    import pandas as pd
+
+    from models.kmeans_model import TRAIN_PATH, load_or_fit_model
+    from utils.data_processor import encode_frame
+
+    parser = argparse.ArgumentParser(description="Publikasikan state model bersama untuk worker Streamlit.")
+    parser.add_argument("--dir", default=os.environ.get("SPPK_SHARED_MODEL_DIR") or SHARED_DIR)
+    parser.add_argument("--train", default=TRAIN_PATH)
+    parser.add_argument("--k", type=int, default=3)
+    args = parser.parse_args()
+    model = load_or_fit_model(train_path=args.train, k=args.k)
+    manifest = publish(model, encode_frame(pd.read_csv(args.train)), args.dir)
+    print(f"✅ Model versi {manifest['version']} dipublikasikan ke {args.dir}")
@@ -0,0 +1,216 @@
+# service.py
+# Layanan prediksi JSON lokal (stdlib http.server) untuk sistem sekolah lain.
+#   python service.py --port 8502 --max-batch 64 --max-wait-ms 5
+#   curl -X POST localhost:8502/predict -d '{"minat": "IPA", "ekskul": "Robotik", "skill": "Analisis Data", ...}'
+# Request yang datang hampir bersamaan digabung menjadi satu batch ter-vektorisasi.
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from models.kmeans_model import predict_clusters
+from models.recommender import rank_majors
+from models.shared_state import model_version
+from utils.cache import current_model
+from utils.data_processor import encode_frame
+from utils.result_cache import model_fingerprint
+from utils.tracing import traced
+
+MAX_BATCH = 64
+MAX_WAIT_MS = 5.0
+REQUEST_TIMEOUT = 30.0
+MAX_BODY_BYTES = 1 << 20  # 1 MiB, ribuan profil per request
+NUMERIC_FIELDS = ("contribution", "achievement", "club_count")
+TEXT_FIELDS = ("minat", "ekskul", "name", "email")
+
+def validate_profile(profile: dict) -> dict:
+    """Salinan profil yang aman di-encode; ValueError berisi pesan untuk klien jika tidak valid."""
+    clean = dict(profile)
+    for field in NUMERIC_FIELDS:
+        value = clean.get(field, 0)
+        if isinstance(value, bool) or value is None:
+            raise ValueError(f"'{field}' harus berupa angka.")
+        try:
+            clean[field] = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"'{field}' harus berupa angka.") from None
+        if clean[field] != clean[field] or clean[field] in (float("inf"), float("-inf")):
+            raise ValueError(f"'{field}' harus berupa angka terhingga.")
+    for field in TEXT_FIELDS:
+        if clean.get(field) is not None and not isinstance(clean[field], str):
+            raise ValueError(f"'{field}' harus berupa teks.")
+    skill = clean.get("skill", "")
+    if isinstance(skill, list):
+        if not all(isinstance(s, str) for s in skill):
+            raise ValueError("'skill' harus berupa teks atau daftar teks.")
+        clean["skill"] = ", ".join(skill)
+    elif skill is None:
+        clean["skill"] = ""
+    elif not isinstance(skill, str):
+        raise ValueError("'skill' harus berupa teks atau daftar teks.")
+    return clean
+
+@traced("service.predict_batch")
+def predict_batch(profiles: list) -> list:
+    """Cluster + ranking jurusan untuk banyak profil sekaligus."""
+    model = current_model()
+    X = encode_frame(pd.DataFrame(profiles))
+    labels, distances = predict_clusters(model, X)
+    majors, scores = rank_majors(X, labels)
+    results = []
+    for i, cluster_id in enumerate(labels):
+        valid = majors[i] != ""
+        results.append({
+            "cluster_id": int(cluster_id),
+            "label": model["labels"].get(str(cluster_id), ""),
+            "distance": float(distances[i]),
+            "majors": majors[i][valid].tolist(),
+            "scores": scores[i][valid].tolist(),
+            "model_version": model_version(model),
+        })
+    return results
+
+class MicroBatcher:
+    """Kumpulkan item hingga `max_batch` atau `max_wait_ms` sejak item pertama, lalu proses sekaligus."""
+
+    def __init__(self, handler, max_batch: int = MAX_BATCH, max_wait_ms: float = MAX_WAIT_MS):
+        self.handler = handler
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, item) -> Future:
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            items = [item for item, _ in batch]
+            try:
+                results = self.handler(items)
+            except Exception:
+                # Satu item buruk tidak boleh menggagalkan request lain di batch yang sama
+                for item, future in batch:
+                    try:
+                        future.set_result(self.handler([item])[0])
+                    except Exception as exc:
+                        future.set_exception(exc)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    batcher = None
+
+    def _send_json(self, status: int, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            model = current_model()
+            self._send_json(200, {"status": "ok", "model_version": model_version(model),
+                                  "model_fingerprint": model_fingerprint(model)})
+        else:
+            self._send_json(404, {"error": "Endpoint tidak ditemukan."})
+
+    def do_POST(self):
+        if self.path != "/predict":
+            self._send_json(404, {"error": "Endpoint tidak ditemukan."})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        # rfile.read(-1) menunggu sampai klien menutup koneksi: tolak sebelum membaca body
+        if length < 0:
+            self._send_json(400, {"error": "Content-Length tidak valid."})
+            return
+        if length > MAX_BODY_BYTES:
+            self._send_json(413, {"error": f"Body melebihi batas {MAX_BODY_BYTES} byte."})
+            return
+        try:
+            payload = json.loads(self.rfile.read(length) or b"null")
+        except (ValueError, json.JSONDecodeError):
+            self._send_json(400, {"error": "Body harus berupa JSON."})
+            return
+        # Satu profil (objek) atau banyak profil ({"profiles": [...]})
+        single = isinstance(payload, dict) and "profiles" not in payload
+        if single:
+            profiles = [payload]
+        else:
+            profiles = payload.get("profiles") if isinstance(payload, dict) else None
+        if not isinstance(profiles, list) or not all(isinstance(p, dict) for p in profiles):
+            self._send_json(400, {"error": "Kirim satu profil atau {\"profiles\": [...]}."})
+            return
+        try:
+            cleaned = []
+            for i, profile in enumerate(profiles):
+                try:
+                    cleaned.append(validate_profile(profile))
+                except ValueError as exc:
+                    raise ValueError(str(exc) if single else f"Profil #{i}: {exc}") from None
+        except ValueError as exc:
+            self._send_json(400, {"error": str(exc)})
+            return
+        profiles = cleaned
+        try:
+            futures = [self.batcher.submit(p) for p in profiles]
+            results = [f.result(timeout=REQUEST_TIMEOUT) for f in futures]
+        except Exception as exc:
+            self._send_json(500, {"error": str(exc)})
+            return
+        self._send_json(200, results[0] if single else {"results": results})
+
+    def log_message(self, format, *args):
+        pass  # jangan tulis log per request ke stderr
+
+class PredictionServer(ThreadingHTTPServer):
+    # Backlog bawaan (5) terlalu kecil untuk banyak klien bersamaan
+    request_queue_size = 128
+
+def serve(host: str = "127.0.0.1", port: int = 8502, max_batch: int = MAX_BATCH, max_wait_ms: float = MAX_WAIT_MS):
+    PredictionHandler.batcher = MicroBatcher(predict_batch, max_batch=max_batch, max_wait_ms=max_wait_ms)
+    current_model()  # fit/muat model sebelum menerima request
+    server = PredictionServer((host, port), PredictionHandler)
+    print(f"✅ Layanan prediksi berjalan di http://{host}:{port} (batch {max_batch}, tunggu {max_wait_ms} ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Layanan JSON lokal untuk clustering & rekomendasi jurusan.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH, help="Maksimal profil per batch")
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS, help="Batas tunggu pengumpulan batch")
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, args.max_batch, args.max_wait_ms)
+
+if __name__ == "__main__":
+    main()
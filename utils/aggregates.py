@@ -0,0 +1,176 @@
+# utils/aggregates.py
+# Agregat kohort yang dipelihara inkremental: setiap submission menambah satu sel (cluster, minat, ekskul).
+# Jumlah sel dibatasi (k x minat x ekskul), jadi dashboard tidak bergantung pada ukuran kohort.
+# Yang dihitung submission, bukan siswa: isi ulang profil menambah hitungan sampai CSV di-compact.
+import json
+import logging
+import os
+import threading
+
+from config import SKILL_LIST
+from utils.storage import CSV_PATH, file_lock
+from utils.tracing import traced
+
+AGGREGATES_PATH = "data/aggregates.json"
+AGGREGATES_FORMAT = 1
+
+logger = logging.getLogger(__name__)
+
+_cache = {"key": None, "data": None}
+_cache_lock = threading.Lock()
+
+def _empty() -> dict:
+    # unassigned: submission yang tersimpan tetapi belum masuk sel karena cluster gagal ditentukan
+    return {"format": AGGREGATES_FORMAT, "cells": {}, "unassigned": 0}
+
+def _cell_key(cluster_id, minat, ekskul) -> str:
+    return json.dumps([cluster_id, minat, ekskul])
+
+def _new_cell() -> dict:
+    return {"count": 0, "contribution_sum": 0.0, "achievement_sum": 0.0, "skills": [0] * len(SKILL_LIST)}
+
+def _load(path: str) -> dict:
+    if not os.path.exists(path):
+        return _empty()
+    with open(path, "r") as f:
+        data = json.load(f)
+    return data if data.get("format") == AGGREGATES_FORMAT else _empty()
+
+def _save(data: dict, path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def _assign_clusters(students: list) -> tuple:
+    """Cluster untuk setiap submission memakai model aktif (dipanggil di thread writer, bukan di request)."""
+    import pandas as pd
+    from models.kmeans_model import predict_clusters
+    from utils.cache import current_model
+    from utils.data_processor import encode_frame
+
+    X = encode_frame(pd.DataFrame(students))
+    labels, _ = predict_clusters(current_model(), X)
+    return [int(c) for c in labels], X
+
+def _add(cells: dict, cluster_id, minat, ekskul, skills, contribution, achievement, count=1):
+    cell = cells.setdefault(_cell_key(cluster_id, minat, ekskul), _new_cell())
+    cell["count"] += count
+    cell["contribution_sum"] += float(contribution)
+    cell["achievement_sum"] += float(achievement)
+    cell["skills"] = [a + int(b) for a, b in zip(cell["skills"], skills)]
+
+@traced("aggregates.write_submissions")
+def write_submissions(students: list, append, path: str = None):
+    """Tulis batch lewat `append` lalu tambahkan ke agregat, di bawah satu lock.
+
+    Satu lock untuk keduanya mencegah rebuild() menghitung baris yang sama dua kali.
+    """
+    path = path or AGGREGATES_PATH
+    try:
+        clusters, X = _assign_clusters(students)
+    except Exception:
+        # Submission tetap tersimpan; dicatat sebagai belum teragregasi sampai rebuild()
+        logger.exception("Gagal menentukan cluster untuk agregat; jalankan rebuild() untuk menyusulkan")
+        clusters, X = None, None
+    skill_cols = slice(2, 2 + len(SKILL_LIST))
+    with file_lock(path):
+        append(students)
+        # Baris sudah tertulis: kegagalan di sini tidak boleh membuat writer menulis ulang batch yang sama
+        try:
+            data = _load(path)
+            if clusters is None:
+                data["unassigned"] = data.get("unassigned", 0) + len(students)
+            else:
+                for student, cluster_id, row in zip(students, clusters, X):
+                    _add(data["cells"], cluster_id, student.get("minat"), student.get("ekskul"),
+                         row[skill_cols], student.get("contribution") or 0, student.get("achievement") or 0)
+            _save(data, path)
+        except Exception:
+            logger.exception("Gagal memperbarui agregat; jalankan rebuild() untuk menyusulkan")
+
+@traced("aggregates.rebuild")
+def rebuild(csv_path: str = None, path: str = None) -> dict:
+    """Hitung ulang semua agregat dari CSV (O(n), hanya saat diminta)."""
+    import pandas as pd
+    from models.kmeans_model import predict_clusters
+    from utils.cache import current_model
+    from utils.compact import load_packed_csv
+    from utils.data_processor import encode_frame
+
+    path = path or AGGREGATES_PATH
+    with file_lock(path):
+        # Bentuk ringkas (kode + label category): memori tetap kecil untuk CSV jutaan baris
+        packed = load_packed_csv(csv_path or CSV_PATH, keep_labels=True)
+        data = _empty()
+        if len(packed):
+            X = encode_frame(packed)
+            frame = pd.DataFrame(X[:, 2:2 + len(SKILL_LIST)], columns=SKILL_LIST)
+            frame["cluster_id"], _ = predict_clusters(current_model(), X)
+            frame["minat"] = packed["minat_label"].to_numpy()
+            frame["ekskul"] = packed["ekskul_label"].to_numpy()
+            frame["contribution"] = packed["contribution"].fillna(0).to_numpy()
+            frame["achievement"] = packed["achievement"].fillna(0).to_numpy()
+            frame["count"] = 1
+            grouped = frame.groupby(["cluster_id", "minat", "ekskul"], dropna=False).sum()
+            for (cluster_id, minat, ekskul), row in grouped.iterrows():
+                _add(data["cells"], int(cluster_id), _none_if_nan(minat), _none_if_nan(ekskul),
+                     row[SKILL_LIST], row["contribution"], row["achievement"], count=int(row["count"]))
+        _save(data, path)
+    return data
+
+def _none_if_nan(value):
+    return None if value != value else value
+
+def load(path: str = None) -> dict:
+    """Agregat dari disk, di-cache per mtime file."""
+    path = path or AGGREGATES_PATH
+    key = (os.path.getmtime(path), os.path.getsize(path)) if os.path.exists(path) else None
+    with _cache_lock:
+        if _cache["key"] != key or _cache["data"] is None:
+            _cache["data"] = _load(path)
+            _cache["key"] = key
+        return _cache["data"]
+
+def summarize(clusters=None, minat=None, ekskul=None, path: str = None) -> dict:
+    """Ringkasan terfilter; None berarti tanpa filter untuk dimensi itu."""
+    path = path or AGGREGATES_PATH
+    data = load(path)
+    total = {"count": 0, "contribution_sum": 0.0, "achievement_sum": 0.0, "skills": [0] * len(SKILL_LIST)}
+    by_cluster, by_minat, by_ekskul = {}, {}, {}
+    for key, cell in data["cells"].items():
+        c, m, e = json.loads(key)
+        if (clusters is not None and c not in clusters) or (minat is not None and m not in minat) \
+                or (ekskul is not None and e not in ekskul):
+            continue
+        total["count"] += cell["count"]
+        total["contribution_sum"] += cell["contribution_sum"]
+        total["achievement_sum"] += cell["achievement_sum"]
+        total["skills"] = [a + b for a, b in zip(total["skills"], cell["skills"])]
+        by_cluster[c] = by_cluster.get(c, 0) + cell["count"]
+        if m is not None:
+            by_minat[m] = by_minat.get(m, 0) + cell["count"]
+        if e is not None:
+            by_ekskul[e] = by_ekskul.get(e, 0) + cell["count"]
+    n = max(total["count"], 1)
+    return {
+        "count": total["count"],
+        "avg_contribution": total["contribution_sum"] / n,
+        "avg_achievement": total["achievement_sum"] / n,
+        "by_cluster": dict(sorted(by_cluster.items())),
+        "by_minat": by_minat,
+        "by_ekskul": by_ekskul,
+        "skills": dict(zip(SKILL_LIST, total["skills"])),
+        "unassigned": data.get("unassigned", 0),
+    }
+
+def dimensions(path: str = None) -> dict:
+    """Nilai cluster/minat/ekskul yang ada, untuk pilihan filter."""
+    path = path or AGGREGATES_PATH
+    keys = [json.loads(key) for key in load(path)["cells"]]
+    return {
+        "clusters": sorted({c for c, _, _ in keys}),
+        "minat": sorted({m for _, m, _ in keys if m is not None}),
+        "ekskul": sorted({e for _, _, e in keys if e is not None}),
+    }
@@ -1,45 +1,49 @@
 # utils/auth.py
 import hashlib
-import json
 import os
+import threading
+
+from utils.tracing import traced
+from utils.user_store import JsonUserStore, SqliteUserStore
 
 USER_DB = "data/users.json"
+USER_SQLITE_DB = "data/users.db"
+# "sqlite" (default) atau "json" untuk backend lama
+USER_BACKEND = os.environ.get("SPPK_USER_BACKEND", "sqlite")
+
+_store = None
+_store_key = None
+_store_lock = threading.Lock()
 
 def hash_password(password: str) -> str:
     return hashlib.sha256(password.encode()).hexdigest()
 
-def load_users():
-    if not os.path.exists(USER_DB):
-        os.makedirs(os.path.dirname(USER_DB), exist_ok=True)
-        with open(USER_DB, "w") as f:
-            json.dump({}, f)
-        return {}
-    with open(USER_DB, "r") as f:
-        return json.load(f)
-
-def save_users(users):
-    with open(USER_DB, "w") as f:
-        json.dump(users, f, indent=4)
+def get_user_store():
+    """Backend user yang aktif; dibuat ulang jika konfigurasi path/backend berubah."""
+    global _store, _store_key
+    key = (USER_BACKEND, USER_DB, USER_SQLITE_DB)
+    with _store_lock:
+        if _store is None or _store_key != key:
+            if USER_BACKEND == "json":
+                _store = JsonUserStore(USER_DB)
+            else:
+                _store = SqliteUserStore(USER_SQLITE_DB, migrate_from=USER_DB)
+            _store_key = key
+        return _store
 
+@traced("auth.register_user")
 def register_user(email: str, password: str) -> bool:
-    users = load_users()
-    if email in users:
-        return False  # Email sudah terdaftar
-    users[email] = hash_password(password)
-    save_users(users)
-    return True
+    # False jika email sudah terdaftar
+    return get_user_store().add(email, hash_password(password))
 
+@traced("auth.authenticate_user")
 def authenticate_user(email: str, password: str) -> bool:
-    users = load_users()
-    if email not in users:
+    stored = get_user_store().get(email)
+    if stored is None:
         return False
-    return users[email] == hash_password(password)
+    return stored == hash_password(password)
 
+@traced("auth.reset_password")
 def reset_password(email: str, new_password: str) -> bool:
     """Reset password untuk email yang sudah terdaftar."""
-    users = load_users()
-    if email not in users:
-        return False
-    users[email] = hash_password(new_password)
-    save_users(users)
-    return True
\ No newline at end of file
+    return get_user_store().update(email, hash_password(new_password))
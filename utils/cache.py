@@ -0,0 +1,113 @@
+# utils/cache.py
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from config import ONLINE_CLUSTERING, SHARED_MODEL_BUILDER, SHARED_MODEL_DIR
+from models.kmeans_model import TRAIN_PATH, load_or_fit_model
+from utils.data_processor import encode_frame
+from utils.tracing import traced
+
+class FileCache:
+    """Cache LRU bersama (satu per proses) yang dikunci pada path + mtime + ukuran file.
+
+    Nilai yang dikembalikan dipakai bersama oleh semua sesi, jadi jangan diubah di tempat.
+    """
+
+    def __init__(self, max_entries: int = 16):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    @staticmethod
+    def _key(kind: str, path: str):
+        stat = os.stat(path)
+        return (kind, os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+    def get(self, kind: str, path: str, loader):
+        key = self._key(kind, path)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # Hanya satu sesi yang memuat; sesi lain menunggu lalu memakai hasil yang sama
+        with key_lock:
+            with self._lock:
+                if key in self._entries:
+                    return self._entries[key]
+            value = loader(path)
+            with self._lock:
+                # Versi lama dari file yang sama sudah tidak berguna
+                for old_key in [k for k in self._entries if k[:2] == key[:2]]:
+                    del self._entries[old_key]
+                self._entries[key] = value
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                self._key_locks.pop(key, None)
+        return value
+
+    def invalidate(self, path: str = None, kind: str = None):
+        """Hapus entri untuk path/jenis tertentu, atau semuanya jika keduanya None."""
+        abspath = os.path.abspath(path) if path else None
+        with self._lock:
+            for key in list(self._entries):
+                if (abspath is None or key[1] == abspath) and (kind is None or key[0] == kind):
+                    del self._entries[key]
+
+_cache = FileCache()
+
+@traced("cache.load_training_frame")
+def load_training_frame(path: str = TRAIN_PATH) -> pd.DataFrame:
+    return _cache.get("frame", path, pd.read_csv)
+
+def _shared_worker() -> bool:
+    # Mode multi-proses: worker tidak pernah fit sendiri, hanya memetakan hasil builder
+    return bool(SHARED_MODEL_DIR) and not SHARED_MODEL_BUILDER
+
+@traced("cache.load_training_matrix")
+def load_training_matrix(path: str = TRAIN_PATH):
+    if _shared_worker() and path == TRAIN_PATH:
+        from models.shared_state import get_shared_state
+        return get_shared_state(SHARED_MODEL_DIR).matrix()
+    return _cache.get("matrix", path, lambda p: encode_frame(load_training_frame(p)))
+
+@traced("cache.load_training_model")
+def load_training_model(path: str = TRAIN_PATH, k: int = 3) -> dict:
+    if _shared_worker() and path == TRAIN_PATH:
+        from models.shared_state import get_shared_state
+        return get_shared_state(SHARED_MODEL_DIR).model()
+    return _cache.get(f"model:k={k}", path, lambda p: load_or_fit_model(train_path=p, k=k))
+
+_clusterer = None  # clusterer online; setelah ada, request cukup membaca .current (tanpa lock/stat)
+
+def _local_model() -> dict:
+    global _clusterer
+    clusterer = _clusterer
+    if clusterer is not None:
+        # Perubahan data latih ditangani thread clusterer sendiri (OnlineClusterer._check_training_data)
+        return clusterer.current
+    model = load_training_model()
+    if ONLINE_CLUSTERING:
+        from models.online import get_online_clusterer
+        _clusterer = get_online_clusterer(model)
+        return _clusterer.current
+    return model
+
+def current_model() -> dict:
+    """Model aktif: hasil fit tersimpan, versi terbaru re-clustering online, atau state bersama dari builder."""
+    if _shared_worker():
+        return load_training_model()
+    model = _local_model()
+    if SHARED_MODEL_DIR:
+        from models.shared_state import get_publisher
+        publisher = get_publisher(SHARED_MODEL_DIR)
+        publisher.publish_if_changed(model, load_training_matrix)
+        publisher.start(_local_model, load_training_matrix)
+    return model
+
+def invalidate(path: str = None, kind: str = None):
+    _cache.invalidate(path, kind)
@@ -0,0 +1,88 @@
+# utils/compact.py
+# Representasi ringkas data siswa: kode kategori uint8, 10 skill sebagai bitmask uint16,
+# club_count uint8, contribution/achievement float64 (rata-rata, disimpan persis) -> 21 byte per siswa.
+# encode_frame(pack_frame(df)) identik dengan encode_frame(df), jadi clustering hasilnya sama.
+import os
+
+import numpy as np
+import pandas as pd
+
+from config import ACADEMIC_CODES, ACTIVITY_CODES, SKILL_LIST
+from utils.data_processor import encode_skills, lookup_codes
+from utils.tracing import traced
+
+PACKED_DTYPES = {
+    "minat": np.uint8,
+    "ekskul": np.uint8,
+    "skill_mask": np.uint16,
+    "club_count": np.uint8,
+    "contribution": np.float64,
+    "achievement": np.float64,
+}
+SOURCE_COLUMNS = ["email", "minat", "ekskul", "skill", "club_count", "contribution", "achievement"]
+SKILL_BITS = (1 << np.arange(len(SKILL_LIST))).astype(np.uint16)
+
+def _club_counts(values) -> np.ndarray:
+    """uint8 jika semua nilai bilangan bulat 0..255; selain itu float64 supaya tidak ada yang berubah."""
+    counts = pd.to_numeric(values).to_numpy(dtype=np.float64)
+    if len(counts) and not (np.isfinite(counts).all() and (counts == np.round(counts)).all()
+                            and counts.min() >= 0 and counts.max() <= np.iinfo(np.uint8).max):
+        return counts
+    return counts.astype(np.uint8)
+
+def pack_frame(df: pd.DataFrame, keep_email: bool = False, keep_labels: bool = False) -> pd.DataFrame:
+    """Ubah DataFrame dengan skema students.csv ke bentuk ringkas.
+
+    keep_labels menyimpan teks minat/ekskul asli (category) untuk agregat per nilai.
+    """
+    packed = pd.DataFrame({
+        "minat": lookup_codes(df["minat"].to_numpy(), ACADEMIC_CODES).astype(np.uint8),
+        "ekskul": lookup_codes(df["ekskul"].to_numpy(), ACTIVITY_CODES).astype(np.uint8),
+        "skill_mask": (encode_skills(df["skill"].to_numpy()).astype(np.uint16) * SKILL_BITS).sum(axis=1, dtype=np.uint16),
+        "club_count": _club_counts(df["club_count"]),
+        "contribution": pd.to_numeric(df["contribution"]).to_numpy(dtype=np.float64),
+        "achievement": pd.to_numeric(df["achievement"]).to_numpy(dtype=np.float64),
+    })
+    if keep_labels:
+        packed["minat_label"] = pd.Categorical(df["minat"])
+        packed["ekskul_label"] = pd.Categorical(df["ekskul"])
+    if keep_email:
+        # Email berulang untuk setiap submission ulang, jadi category jauh lebih hemat
+        packed["email"] = pd.Categorical(df["email"])
+    return packed
+
+@traced("compact.load_packed_csv")
+def load_packed_csv(csv_path: str, chunksize: int = 100_000, keep_email: bool = False,
+                    keep_labels: bool = False) -> pd.DataFrame:
+    """Baca CSV per chunk dan langsung ringkas, sehingga kolom teks tidak pernah dimuat sekaligus."""
+    usecols = SOURCE_COLUMNS if keep_email else SOURCE_COLUMNS[1:]
+    chunks = []
+    if os.path.exists(csv_path):
+        chunks = [
+            pack_frame(chunk, keep_email=keep_email, keep_labels=keep_labels)
+            for chunk in pd.read_csv(csv_path, usecols=usecols, chunksize=chunksize)
+        ]
+    if not chunks:
+        return pack_frame(pd.DataFrame(columns=usecols), keep_email=keep_email, keep_labels=keep_labels)
+    packed = pd.concat(chunks, ignore_index=True)
+    # Kategori per chunk bisa berbeda (hasil concat jadi object): satukan lagi
+    for column in ("email", "minat_label", "ekskul_label"):
+        if column in packed:
+            packed[column] = packed[column].astype("category")
+    return packed
+
+def save_packed(packed: pd.DataFrame, path: str):
+    """Simpan bentuk ringkas sebagai .npz (satu array per kolom)."""
+    arrays = {name: packed[name].to_numpy() for name in PACKED_DTYPES}
+    if "email" in packed.columns:
+        emails = packed["email"].astype("category")
+        arrays["email_codes"] = emails.cat.codes.to_numpy()
+        arrays["email_categories"] = emails.cat.categories.to_numpy(dtype=str)
+    np.savez(path, **arrays)
+
+def load_packed(path: str) -> pd.DataFrame:
+    with np.load(path, allow_pickle=False) as data:
+        packed = pd.DataFrame({name: data[name] for name in PACKED_DTYPES})
+        if "email_codes" in data:
+            packed["email"] = pd.Categorical.from_codes(data["email_codes"], data["email_categories"])
+    return packed
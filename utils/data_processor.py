@@ -1,25 +1,88 @@
 # utils/data_processor.py
+import numpy as np
+import pandas as pd
 from config import ACADEMIC_CODES as MINAT_MAP
 from config import ACTIVITY_CODES as EKSKUL_MAP
 from config import SKILL_LIST
+from utils.tracing import traced
+
+FEATURE_COLUMNS = ["minat", "ekskul", *SKILL_LIST, "contribution", "achievement", "club_count"]
 
 def one_hot_encode_skills(skill_string: str):
     selected = [s.strip() for s in skill_string.split(",") if s.strip()]
     return [1 if skill in selected else 0 for skill in SKILL_LIST]
 
+def lookup_codes(values, mapping: dict) -> np.ndarray:
+    # Petakan nilai unik saja; nilai kosong/tidak dikenal menjadi 0
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+    table = np.array([mapping.get(u, 0) for u in uniques] + [0])
+    return table[codes]
+
+def encode_skills(skills) -> np.ndarray:
+    """Multi-hot skill untuk satu kolom sekaligus (int8, baris x len(SKILL_LIST))."""
+    # Kombinasi skill jauh lebih sedikit dari jumlah baris: encode nilai unik saja
+    codes, uniques = pd.factorize(np.asarray(skills, dtype=object))
+    table = np.zeros((len(uniques) + 1, len(SKILL_LIST)), dtype=np.int8)
+    for i, skill_string in enumerate(uniques):
+        table[i] = one_hot_encode_skills(str(skill_string))
+    return table[codes]
+
+def encode_columns(minat, ekskul, skill, contribution, achievement, club_count, dtype=np.float64) -> np.ndarray:
+    """Encode kolom-kolom profil (list/Series/array dengan panjang sama) menjadi matriks fitur."""
+    matrix = np.empty((len(minat), len(FEATURE_COLUMNS)), dtype=dtype)
+    matrix[:, 0] = lookup_codes(minat, MINAT_MAP)
+    matrix[:, 1] = lookup_codes(ekskul, EKSKUL_MAP)
+    matrix[:, 2:2 + len(SKILL_LIST)] = encode_skills(skill)
+    matrix[:, -3] = contribution
+    matrix[:, -2] = achievement
+    matrix[:, -1] = club_count
+    return matrix
+
+@traced("data_processor.encode_frame")
+def encode_frame(df: pd.DataFrame, dtype=np.float64) -> np.ndarray:
+    """Ubah seluruh DataFrame profil menjadi matriks fitur dalam satu langkah."""
+    if "skill_mask" in df.columns:
+        return encode_packed(df, dtype=dtype)
+
+    def column(name, default):
+        if name in df.columns:
+            return df[name].to_numpy()
+        return np.full(len(df), default, dtype=object)
+
+    return encode_columns(
+        column("minat", None),
+        column("ekskul", None),
+        column("skill", ""),
+        pd.to_numeric(column("contribution", 0)),
+        pd.to_numeric(column("achievement", 0)),
+        pd.to_numeric(column("club_count", 0)),
+        dtype=dtype,
+    )
+
+def encode_packed(packed: pd.DataFrame, dtype=np.float64) -> np.ndarray:
+    """Matriks fitur langsung dari bentuk ringkas (lihat utils/compact.py)."""
+    matrix = np.empty((len(packed), len(FEATURE_COLUMNS)), dtype=dtype)
+    matrix[:, 0] = packed["minat"].to_numpy()
+    matrix[:, 1] = packed["ekskul"].to_numpy()
+    # Bit ke-i dari skill_mask = SKILL_LIST[i]
+    mask = packed["skill_mask"].to_numpy()
+    matrix[:, 2:2 + len(SKILL_LIST)] = (mask[:, None] >> np.arange(len(SKILL_LIST), dtype=mask.dtype)) & 1
+    matrix[:, -3] = packed["contribution"].to_numpy()
+    matrix[:, -2] = packed["achievement"].to_numpy()
+    matrix[:, -1] = packed["club_count"].to_numpy()
+    return matrix
+
+@traced("data_processor.student_to_vector")
 def student_to_vector(profile: dict):
-    minat_code = MINAT_MAP.get(profile.get("minat"), 0)
-    ekskul_code = EKSKUL_MAP.get(profile.get("ekskul"), 0)
-    skills = profile.get("skill", "")
-    skill_vector = one_hot_encode_skills(skills)
-    contribution = profile.get("contribution", 0)
-    achievement = profile.get("achievement", 0)
-    club_count = profile.get("club_count", 0)
+    # Keluaran sama persis dengan versi awal: kode & skill int, nilai numerik apa adanya
+    codes = np.concatenate([
+        lookup_codes([profile.get("minat")], MINAT_MAP),
+        lookup_codes([profile.get("ekskul")], EKSKUL_MAP),
+        encode_skills([profile.get("skill", "")])[0],
+    ])
     return [
-        minat_code,
-        ekskul_code,
-        *skill_vector,
-        contribution,
-        achievement,
-        club_count
-    ]
\ No newline at end of file
+        *codes.tolist(),
+        profile.get("contribution", 0),
+        profile.get("achievement", 0),
+        profile.get("club_count", 0)
+    ]
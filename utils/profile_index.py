@@ -0,0 +1,211 @@
+# utils/profile_index.py
+# Indeks profil per email di atas students.csv: email -> offset byte setiap baris miliknya.
+# Profil terbaru & riwayat cukup seek ke offset, tanpa memindai file; baris baru dibaca secara inkremental.
+#   python -m utils.profile_index --compact   -> buang baris lama yang sudah digantikan dari CSV
+import argparse
+import csv
+import os
+import threading
+
+from utils.storage import CSV_PATH, STUDENT_COLUMNS, append_rows, file_lock, flush_submissions, save_student_to_csv
+from utils.tracing import traced
+
+NUMERIC_FIELDS = {"club_count": int, "contribution": float, "achievement": float}
+
+def _parse_line(line: bytes) -> list:
+    return next(csv.reader([line.decode("utf-8")]), [])
+
+def _to_profile(header: list, values: list) -> dict:
+    profile = dict(zip(header, values))
+    for field, cast in NUMERIC_FIELDS.items():
+        if profile.get(field) not in (None, ""):
+            try:
+                profile[field] = cast(float(profile[field]))
+            except ValueError:
+                pass
+    return profile
+
+class ProfileIndex:
+    def __init__(self, csv_path: str = None):
+        self.csv_path = csv_path or CSV_PATH
+        self._lock = threading.Lock()
+        self._build_thread = None
+        self._reset()
+
+    def _reset(self):
+        self._offsets = {}      # email -> [offset baris, ...] urut waktu
+        self._header = None
+        self._email_col = None
+        self._scanned = 0       # offset byte yang sudah diindeks
+        self._file_id = None
+        self._pending = {}      # email -> (jumlah baris saat upsert, profil) sampai writer menulisnya
+
+    @traced("profile_index.refresh")
+    def refresh(self):
+        """Indeks baris yang ditambahkan sejak pemanggilan terakhir (indeks ulang jika CSV ditulis ulang)."""
+        try:
+            stat = os.stat(self.csv_path)
+        except FileNotFoundError:
+            return
+        file_id = (stat.st_dev, stat.st_ino)
+        with self._lock:
+            if file_id != self._file_id or stat.st_size < self._scanned:
+                # CSV ditulis ulang (compaction sudah flush antrean writer dulu): indeks dari awal
+                self._reset()
+                self._file_id = file_id
+            if stat.st_size == self._scanned:
+                return
+            with open(self.csv_path, "rb") as f:
+                f.seek(self._scanned)
+                offset = self._scanned
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # writer sedang menulis baris ini
+                    if self._header is None:
+                        self._header = _parse_line(line)
+                        self._email_col = self._header.index("email") if "email" in self._header else None
+                    elif line.strip():
+                        self._offsets.setdefault(self._email(line), []).append(offset)
+                    offset += len(line)
+                self._scanned = offset
+
+    def refresh_in_background(self):
+        """Bangun indeks di thread latar (sekali per proses), supaya request pertama tidak memindai CSV."""
+        with self._lock:
+            if self._build_thread is not None:
+                return
+            self._build_thread = threading.Thread(target=self.refresh, name="profile-index", daemon=True)
+        self._build_thread.start()
+
+    def _email(self, line: bytes) -> str:
+        if self._email_col is None:
+            return ""
+        if self._email_col == 0 and not line.startswith(b'"'):
+            # Jalur cepat: email di kolom pertama tanpa kutip, cukup potong sampai koma pertama
+            return line.split(b",", 1)[0].rstrip(b"\r\n").decode("utf-8")
+        values = _parse_line(line)
+        # Baris lebih pendek dari header (mis. terpotong) tidak punya email
+        return values[self._email_col] if self._email_col < len(values) else ""
+
+    def _read_rows(self, offsets: list):
+        """Baris pada offset; None jika CSV ditulis ulang sejak diindeks (offset sudah tidak berlaku)."""
+        rows = []
+        with open(self.csv_path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if (stat.st_dev, stat.st_ino) != self._file_id or stat.st_size < self._scanned:
+                return None
+            for offset in offsets:
+                f.seek(offset)
+                rows.append(_to_profile(self._header, _parse_line(f.readline())))
+        return rows
+
+    def upsert(self, profile: dict):
+        """Simpan versi baru profil (lewat writer latar) dan langsung jadikan versi terbaru."""
+        self.refresh()
+        email = profile.get("email") or ""
+        with self._lock:
+            self._pending[email] = (len(self._offsets.get(email, [])), dict(profile))
+        if os.path.abspath(self.csv_path) == os.path.abspath(CSV_PATH):
+            save_student_to_csv(profile)
+        else:
+            append_rows([profile], self.csv_path)
+
+    @traced("profile_index.latest")
+    def latest(self, email: str):
+        """Profil terbaru untuk email, atau None."""
+        while True:
+            self.refresh()
+            with self._lock:
+                offsets = self._offsets.get(email, [])
+                pending = self._pending.get(email)
+                if pending is not None:
+                    if len(offsets) <= pending[0]:
+                        return dict(pending[1])
+                    del self._pending[email]
+                if not offsets:
+                    return None
+                rows = self._read_rows(offsets[-1:])
+            if rows is not None:
+                return rows[0]
+            # CSV di-compact di antara refresh dan pembacaan: indeks ulang lalu coba lagi
+
+    def history(self, email: str) -> list:
+        """Semua versi profil untuk email, dari yang terlama."""
+        while True:
+            self.refresh()
+            with self._lock:
+                rows = self._read_rows(self._offsets.get(email, []))
+            if rows is not None:
+                return rows
+
+    def emails(self) -> list:
+        self.refresh()
+        with self._lock:
+            return [email for email in self._offsets if email]
+
+@traced("profile_index.compact")
+def compact_profiles(csv_path: str = None) -> int:
+    """Tulis ulang CSV dengan hanya baris terbaru per email; kembalikan jumlah baris yang dibuang.
+
+    Baris tanpa email tidak bisa dibandingkan, jadi semuanya dipertahankan. Untuk CSV aplikasi,
+    agregat kohort dihitung ulang supaya baris yang dibuang tidak lagi terhitung.
+    """
+    csv_path = csv_path or CSV_PATH
+    flush_submissions()
+    if not os.path.exists(csv_path):
+        return 0
+    with file_lock(csv_path):
+        with open(csv_path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None) or STUDENT_COLUMNS
+            rows = list(reader)
+        email_col = header.index("email") if "email" in header else None
+        if email_col is None:
+            return 0
+        last_row = {}
+        emails = [row[email_col] if len(row) > email_col else "" for row in rows]
+        for i, email in enumerate(emails):
+            if email:
+                last_row[email] = i
+        kept = [row for i, (row, email) in enumerate(zip(rows, emails))
+                if row and (not email or last_row[email] == i)]
+        removed = len(rows) - len(kept)
+        if removed == 0:
+            return 0
+        tmp_path = f"{csv_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(kept)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, csv_path)
+    # Setelah lock CSV dilepas: writer mengambil lock agregat dulu baru lock CSV
+    if os.path.abspath(csv_path) == os.path.abspath(CSV_PATH):
+        from utils import aggregates
+        aggregates.rebuild(csv_path)
+    return removed
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def get_profile_index(csv_path: str = None) -> ProfileIndex:
+    """Indeks bersama per proses untuk satu file CSV."""
+    path = os.path.abspath(csv_path or CSV_PATH)
+    with _indexes_lock:
+        if path not in _indexes:
+            _indexes[path] = ProfileIndex(csv_path)
+        return _indexes[path]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kelola indeks profil siswa per email.")
+    parser.add_argument("--csv", default=CSV_PATH)
+    parser.add_argument("--compact", action="store_true", help="Buang baris yang sudah digantikan versi baru")
+    parser.add_argument("--email", help="Tampilkan riwayat profil untuk email ini")
+    args = parser.parse_args()
+    if args.compact:
+        removed = compact_profiles(args.csv)
+        print(f"✅ {removed} baris lama dibuang dari {args.csv}")
+    if args.email:
+        for profile in get_profile_index(args.csv).history(args.email):
+            print(profile)
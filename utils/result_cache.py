@@ -0,0 +1,199 @@
+# utils/result_cache.py
+# Cache hasil clustering + rekomendasi, dikunci pada hash vektor profil ter-encode + sidik jari model.
+# Tier memori (LRU) per proses, ditambah tier SQLite opsional yang bertahan setelah restart.
+# Entri model lama tidak pernah cocok lagi (sidik jari ada di key) dan tersingkir oleh pemangkasan LRU.
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from config import RESULT_CACHE_DB
+from utils.tracing import traced
+
+MEMORY_ENTRIES = 1024
+DISK_ENTRIES = 50_000
+PRUNE_EVERY = 256         # pemangkasan tier disk setelah sekian put
+
+logger = logging.getLogger(__name__)
+
+_last_fingerprint = (None, None)  # (model, sidik jari) terakhir; model diganti sebagai dict baru, tidak dimutasi
+
+def model_fingerprint(model: dict) -> str:
+    """Hash isi model (scaler, centroid, k, label).
+
+    Berbeda dari label versi (models.shared_state.model_version): label itu bisa sama untuk model
+    berbeda di worker lain atau setelah restart, sehingga hasil di tier SQLite bersama tertukar.
+    """
+    global _last_fingerprint
+    last_model, fingerprint = _last_fingerprint
+    if last_model is model:
+        return fingerprint
+    h = hashlib.sha256()
+    for key in ("scaler_mean", "scaler_scale", "centroids"):
+        h.update(np.ascontiguousarray(model[key], dtype=np.float64).tobytes())
+    h.update(json.dumps([int(model["k"]), model["labels"]], sort_keys=True).encode("utf-8"))
+    fingerprint = h.hexdigest()[:16]
+    _last_fingerprint = (model, fingerprint)
+    return fingerprint
+
+def result_key(vector, fingerprint: str) -> str:
+    """Hash kanonik: float64 kontigu (+0.0 menyeragamkan -0.0) lalu sidik jari model."""
+    canonical = np.ascontiguousarray(vector, dtype=np.float64) + 0.0
+    h = hashlib.sha256(canonical.tobytes())
+    h.update(fingerprint.encode("utf-8"))
+    return h.hexdigest()
+
+class ResultCache:
+    def __init__(self, max_entries: int = MEMORY_ENTRIES, path: str = None, max_disk_entries: int = DISK_ENTRIES):
+        self.max_entries = max_entries
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+        self.fingerprint = None
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if path:
+            try:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                with self._connection() as conn:
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS results ("
+                        "key TEXT PRIMARY KEY, version TEXT NOT NULL, payload TEXT NOT NULL, used_at REAL NOT NULL)"
+                    )
+                    conn.execute("CREATE INDEX IF NOT EXISTS results_used_at ON results (used_at)")
+            except (OSError, sqlite3.Error):
+                logger.exception("Tier disk cache hasil (%s) tidak bisa dibuka; hanya tier memori yang dipakai", path)
+                self.path = None
+
+    def _connection(self):
+        # Satu koneksi per thread (sesi Streamlit berjalan di thread berbeda)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _check_fingerprint(self, fingerprint: str):
+        """Model berganti: kosongkan tier memori proses ini.
+
+        Tier disk tidak dihapus: worker lain bisa sedang memakai model lain, dan entri lama tidak
+        akan cocok lagi karena sidik jari ada di key; pemangkasan LRU yang membuangnya.
+        """
+        if fingerprint == self.fingerprint:
+            return
+        with self._lock:
+            if fingerprint == self.fingerprint:
+                return
+            self._entries.clear()
+            self.fingerprint = fingerprint
+
+    def _remember(self, key: str, result: dict):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _disk_get(self, key: str):
+        try:
+            with self._connection() as conn:
+                row = conn.execute("SELECT payload FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE results SET used_at = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error:
+            # Tier disk hanya percepatan: lock timeout dsb. diperlakukan sebagai miss
+            logger.warning("Gagal membaca tier disk cache hasil", exc_info=True)
+            return None
+        return json.loads(row[0]) if row is not None else None
+
+    @traced("result_cache.get")
+    def get(self, vector, model: dict):
+        fingerprint = model_fingerprint(model)
+        self._check_fingerprint(fingerprint)
+        key = result_key(vector, fingerprint)
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+        if self.path:
+            result = self._disk_get(key)
+            if result is not None:
+                self._remember(key, result)
+                with self._lock:
+                    self.hits += 1
+                return result
+        with self._lock:
+            self.misses += 1
+        return None
+
+    @traced("result_cache.put")
+    def put(self, vector, model: dict, result: dict):
+        fingerprint = model_fingerprint(model)
+        self._check_fingerprint(fingerprint)
+        key = result_key(vector, fingerprint)
+        self._remember(key, result)
+        if self.path:
+            try:
+                with self._connection() as conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO results (key, version, payload, used_at) VALUES (?, ?, ?, ?)",
+                        (key, fingerprint, json.dumps(result), time.time())
+                    )
+            except sqlite3.Error:
+                logger.warning("Gagal menulis tier disk cache hasil", exc_info=True)
+                return
+            self._puts += 1
+            if self._puts % PRUNE_EVERY == 0:
+                self.prune()
+
+    def prune(self):
+        """Batasi ukuran tier disk: buang entri yang paling lama tidak dipakai."""
+        if self.path:
+            try:
+                with self._connection() as conn:
+                    conn.execute(
+                        "DELETE FROM results WHERE key IN "
+                        "(SELECT key FROM results ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                        (self.max_disk_entries,)
+                    )
+            except sqlite3.Error:
+                logger.warning("Gagal memangkas tier disk cache hasil", exc_info=True)
+
+    def get_or_compute(self, vector, model: dict, compute) -> dict:
+        """Hasil tersimpan untuk (vektor, sidik jari model), atau hitung dengan `compute()` lalu simpan."""
+        result = self.get(vector, model)
+        if result is None:
+            result = compute()
+            self.put(vector, model, result)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.path:
+            with self._connection() as conn:
+                conn.execute("DELETE FROM results")
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_result_cache() -> ResultCache:
+    """Cache bersama per proses; tier disk aktif jika SPPK_RESULT_CACHE_DB tidak kosong."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResultCache(path=RESULT_CACHE_DB or None)
+        return _cache
@@ -0,0 +1,61 @@
+# utils/startup.py
+# Import modul berat (numpy, pandas, scikit-learn, matplotlib) secara lazy dan ukur biayanya.
+# Halaman login/daftar tidak membutuhkannya; halaman process/result memanggil warm_up() dulu.
+#   python -m utils.startup   -> cetak biaya import per modul pada interpreter baru
+import importlib
+import sys
+import threading
+import time
+
+from utils import tracing
+
+# Urutan penting: dependensi dulu supaya biaya tiap baris tidak saling tumpang tindih
+HEAVY_MODULES = [
+    "numpy",
+    "pandas",
+    "sklearn.cluster",
+    "sklearn.neighbors",
+    "matplotlib.backends.backend_agg",
+    "utils.data_processor",
+    "models.kmeans_model",
+    "models.recommender",
+    "utils.cache",
+    "models.neighbors",
+    "utils.visualizer",
+]
+
+IMPORT_TIMES = {}  # modul -> detik (hanya import pertama yang tercatat)
+_warm_lock = threading.Lock()
+_warm_thread = None
+
+def timed_import(name: str):
+    """Import modul; jika belum pernah dimuat, catat lama import-nya."""
+    if name in sys.modules:
+        return sys.modules[name]
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    elapsed = time.perf_counter() - start
+    IMPORT_TIMES.setdefault(name, elapsed)
+    tracing.record(f"import.{name}", elapsed)
+    return module
+
+def warm_up(modules=HEAVY_MODULES):
+    """Muat semua modul berat (tanpa biaya jika sudah dimuat)."""
+    with _warm_lock:
+        for name in modules:
+            timed_import(name)
+
+def warm_up_in_background(modules=HEAVY_MODULES):
+    """Muat modul berat di thread latar setelah halaman pertama tampil (sekali per proses)."""
+    global _warm_thread
+    if _warm_thread is None:
+        _warm_thread = threading.Thread(target=warm_up, args=(modules,), name="warm-up", daemon=True)
+        _warm_thread.start()
+
+if __name__ == "__main__":
+    total_start = time.perf_counter()
+    warm_up()
+    total = time.perf_counter() - total_start
+    for name, seconds in IMPORT_TIMES.items():
+        print(f"{name:25s} {seconds * 1000:8.1f} ms")
+    print(f"{'total':25s} {total * 1000:8.1f} ms")
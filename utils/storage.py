@@ -1,25 +1,288 @@
-import pandas as pd
+import atexit
+import csv
+import io
+import json
+import logging
 import os
+import queue
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from utils.tracing import traced
+
+# pandas di-import di dalam fungsi: halaman input cukup mengantrekan baris tanpa memuat pandas
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
 CSV_PATH = "data/students.csv"
+COLUMNAR_PATH = "data/students.parquet"
+STUDENT_COLUMNS = ["email", "name", "minat", "ekskul", "skill", "club_count", "contribution", "achievement"]
 
-def save_student_to_csv(student):
-    print("🔥 save_student_to_csv DIPANGGIL")
-    print(student)
+BATCH_SIZE = 256          # maksimal baris per flush
+FLUSH_INTERVAL = 0.2      # detik menunggu baris tambahan sebelum flush
+COMPACT_EVERY = 1000      # compaction ke format kolumnar setelah minimal N baris baru ...
+COMPACT_INTERVAL = 300    # ... dan minimal sekian detik sejak compaction terakhir
+RETRY_BASE_DELAY = 0.1    # detik tunggu setelah gagal menulis; digandakan tiap kegagalan berturut-turut
+RETRY_MAX_DELAY = 5.0
+EXIT_FLUSH_TIMEOUT = 30.0 # detik maksimal menunggu antrean saat proses berhenti
 
-    if not student:
-        print("❌ student kosong")
-        return
+logger = logging.getLogger(__name__)
+
+@contextmanager
+def file_lock(path: str):
+    """Lock eksklusif antar-proses memakai file pendamping `<path>.lock`."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(f"{path}.lock", "a+") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+@traced("storage.append_rows")
+def append_rows(rows, csv_path: str = None):
+    """Tulis satu batch baris ke CSV di bawah lock, lalu fsync."""
+    csv_path = csv_path or CSV_PATH
+    with file_lock(csv_path):
+        with open(csv_path, "a+", newline="", encoding="utf-8") as f:
+            f.seek(0)
+            header_line = f.readline()
+            header = next(csv.reader([header_line])) if header_line.strip() else STUDENT_COLUMNS
+            f.seek(0, os.SEEK_END)
+            writer = csv.DictWriter(f, fieldnames=header, extrasaction="ignore")
+            if not header_line.strip():
+                writer.writeheader()
+            writer.writerows(rows)
+            f.flush()
+            os.fsync(f.fileno())
+
+SOURCE_METADATA_KEY = b"sppk_source"  # identitas CSV sumber di metadata Parquet
+
+def _csv_source(csv_path: str) -> dict:
+    stat = os.stat(csv_path)
+    return {"dev": stat.st_dev, "ino": stat.st_ino, "size": stat.st_size}
+
+@traced("storage.compact_submissions")
+def compact_submissions(csv_path: str = None, out_path: str = None):
+    """Tulis ulang log CSV menjadi file kolumnar (Parquet) untuk pembacaan analitik.
+
+    Identitas CSV sumber (device, inode, ukuran) disimpan di metadata Parquet; load_students
+    hanya memakai file kolumnar selama CSV masih persis sama.
+    """
+    csv_path = csv_path or CSV_PATH
+    out_path = out_path or COLUMNAR_PATH
+    if not os.path.exists(csv_path):
+        return None
+    import pandas as pd
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        # pyarrow tidak terpasang: CSV tetap jadi sumber data
+        logger.warning("pyarrow tidak terpasang; compaction kolumnar dilewati")
+        return None
+
+    # Tetap di bawah lock sampai file kolumnar terpasang, supaya tidak ada baris yang terlewat
+    with file_lock(csv_path):
+        source = _csv_source(csv_path)
+        table = pa.Table.from_pandas(pd.read_csv(csv_path), preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[SOURCE_METADATA_KEY] = json.dumps(source).encode("utf-8")
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(out_path) or ".", suffix=".tmp")
+        os.close(fd)
+        try:
+            pq.write_table(table.replace_schema_metadata(metadata), tmp_path)
+            os.replace(tmp_path, out_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    return out_path
+
+def _columnar_source(columnar_path: str):
+    """Identitas CSV yang dipakai membuat file kolumnar, atau None jika tidak terbaca."""
+    try:
+        import pyarrow.parquet as pq
+        metadata = pq.read_schema(columnar_path).metadata or {}
+        return json.loads(metadata[SOURCE_METADATA_KEY])
+    except (ImportError, OSError, KeyError, ValueError):
+        return None
+
+@traced("storage.load_students")
+def load_students(csv_path: str = None, columnar_path: str = None) -> "pd.DataFrame":
+    """Baca semua submission; pakai file kolumnar hanya jika dibuat dari isi CSV yang sekarang."""
+    import pandas as pd
+
+    csv_path = csv_path or CSV_PATH
+    columnar_path = columnar_path or COLUMNAR_PATH
+    if not os.path.exists(csv_path):
+        return pd.DataFrame(columns=STUDENT_COLUMNS)
+    if os.path.exists(columnar_path) and _columnar_source(columnar_path) == _csv_source(csv_path):
+        try:
+            return pd.read_parquet(columnar_path)
+        except (ImportError, OSError):
+            pass
+    return pd.read_csv(csv_path)
 
-    os.makedirs("data", exist_ok=True)
+class CsvTail:
+    """Baca baris yang ditambahkan ke CSV sejak pembacaan terakhir (berdasarkan offset byte)."""
 
-    df = pd.DataFrame([student])
+    def __init__(self, csv_path: str = None):
+        self.csv_path = csv_path or CSV_PATH
+        self.offset = 0
+        self.header = None
+        self.file_id = None     # (st_dev, st_ino) file yang offset-nya berlaku
 
-    if not os.path.exists(CSV_PATH):
-        print("🆕 Membuat file students.csv")
-        df.to_csv(CSV_PATH, index=False)
-    else:
-        print("➕ Append ke students.csv")
-        df.to_csv(CSV_PATH, mode="a", header=False, index=False)
+    def read(self):
+        """Kembalikan (baris_baru, reset); reset=True jika file ditulis ulang sehingga dibaca dari awal."""
+        import pandas as pd
+
+        try:
+            stat = os.stat(self.csv_path)
+        except FileNotFoundError:
+            return pd.DataFrame(), False
+        file_id = (stat.st_dev, stat.st_ino)
+        size = stat.st_size
+        # CSV ditulis ulang (compaction lewat os.replace berganti inode, atau dipotong): mulai dari awal.
+        # Tail pertama kali (file_id None) tidak dihitung reset.
+        reset = (self.file_id is not None and file_id != self.file_id) or size < self.offset
+        if reset:
+            self.offset, self.header = 0, None
+        self.file_id = file_id
+        if size == self.offset:
+            return pd.DataFrame(), reset
+        with open(self.csv_path, "r", encoding="utf-8", newline="") as f:
+            f.seek(self.offset)
+            chunk = f.read()
+        # Hanya baris yang sudah lengkap (writer mungkin sedang menulis)
+        end = chunk.rfind("\n") + 1
+        if end == 0:
+            return pd.DataFrame(), reset
+        chunk = chunk[:end]
+        self.offset += len(chunk.encode("utf-8"))
+        if self.header is None:
+            self.header, _, chunk = chunk.partition("\n")
+        if not chunk.strip():
+            return pd.DataFrame(), reset
+        return pd.read_csv(io.StringIO(f"{self.header}\n{chunk}")), reset
+
+    def skip_to_end(self):
+        """Anggap seluruh isi file saat ini sudah dibaca (panggil di bawah file_lock CSV)."""
+        try:
+            stat = os.stat(self.csv_path)
+        except FileNotFoundError:
+            self.offset, self.header, self.file_id = 0, None, None
+            return
+        with open(self.csv_path, "r", encoding="utf-8", newline="") as f:
+            header = f.readline()
+        # Header disimpan seperti di read(): tanpa "\n" penutup
+        self.header = header.partition("\n")[0] if header else None
+        self.offset = stat.st_size if header else 0
+        self.file_id = (stat.st_dev, stat.st_ino)
+
+class SubmissionWriter:
+    """Write-behind: submit() hanya memasukkan ke antrean, thread latar menulis per batch."""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._since_compact = 0
+        self._last_compact = time.monotonic()
+        self._failed = []  # batch yang gagal ditulis; dicoba lagi sebelum baris baru
+
+    def submit(self, record: dict):
+        self._ensure_started()
+        self._queue.put(dict(record))
+
+    def flush(self, timeout: float = None) -> bool:
+        """Tunggu sampai semua baris di antrean sudah tertulis ke disk; False jika timeout habis dulu."""
+        if self._thread is None:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def pending(self) -> int:
+        """Jumlah baris yang belum tertulis (di antrean atau menunggu percobaan ulang)."""
+        return self._queue.unfinished_tasks
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="submission-writer", daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        delay = RETRY_BASE_DELAY
+        while True:
+            batch = self._failed or [self._queue.get()]
+            self._failed = []
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch)
+            except Exception:
+                # Jangan buang baris: simpan batch dan coba lagi dengan jeda yang makin panjang
+                logger.exception("Gagal menyimpan %d submission; dicoba lagi dalam %.1f detik", len(batch), delay)
+                self._failed = batch
+                time.sleep(delay)
+                delay = min(delay * 2, RETRY_MAX_DELAY)
+                continue
+            delay = RETRY_BASE_DELAY
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write(self, batch):
+        # Append CSV + update agregat kohort (utils/aggregates.py) di bawah satu lock
+        from utils import aggregates
+        aggregates.write_submissions(batch, append_rows)
+        self._since_compact += len(batch)
+        # Compaction membaca ulang seluruh log, jadi jangan dijalankan terlalu sering
+        if self._since_compact >= COMPACT_EVERY and time.monotonic() - self._last_compact >= COMPACT_INTERVAL:
+            self._since_compact = 0
+            self._last_compact = time.monotonic()
+            try:
+                compact_submissions()
+            except Exception:
+                # Baris sudah aman di CSV; jangan sampai batch ditulis ulang karena compaction gagal
+                logger.exception("Compaction ke %s gagal; CSV tetap jadi sumber data", COLUMNAR_PATH)
+
+_writer = SubmissionWriter()
+
+@atexit.register
+def _flush_at_exit():
+    if not _writer.flush(EXIT_FLUSH_TIMEOUT):
+        logger.error("%d submission belum tertulis ke %s saat proses berhenti", _writer.pending(), CSV_PATH)
+
+@traced("storage.save_student_to_csv")
+def save_student_to_csv(student):
+    if not student:
+        return
+    _writer.submit(student)
 
-    print("✅ BERHASIL SIMPAN")
+def flush_submissions():
+    _writer.flush()
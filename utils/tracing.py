@@ -0,0 +1,123 @@
+# utils/tracing.py
+# Tracing ringan: span bernama -> ring buffer durasi terakhir per stage.
+# Aktifkan dengan SPPK_TRACE=1 (atau set_enabled(True) dari panel admin).
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+
+ENABLED = os.environ.get("SPPK_TRACE", "0") == "1"
+RING_SIZE = 2048
+METRICS_PATH = "data/metrics.json"
+EXPORT_INTERVAL = 60  # detik
+
+_timings = {}
+_lock = threading.Lock()
+_exporter = None
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+def set_enabled(enabled: bool):
+    global ENABLED
+    ENABLED = enabled
+
+def span(name: str):
+    """Context manager pengukur durasi; tanpa biaya berarti jika tracing nonaktif."""
+    if not ENABLED:
+        return _NULL_SPAN
+    return _Span(name)
+
+def traced(name: str):
+    """Decorator: ukur setiap panggilan fungsi sebagai span `name`."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+def record(name: str, seconds: float):
+    buffer = _timings.get(name)
+    if buffer is None:
+        with _lock:
+            buffer = _timings.setdefault(name, deque(maxlen=RING_SIZE))
+    buffer.append(seconds)
+
+def summary() -> dict:
+    """Statistik per stage (ms) dari isi ring buffer saat ini."""
+    import numpy as np
+
+    with _lock:
+        snapshot = {name: list(buffer) for name, buffer in _timings.items()}
+    stats = {}
+    for name, values in sorted(snapshot.items()):
+        if not values:
+            continue
+        ms = np.asarray(values) * 1000
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        stats[name] = {"count": len(ms), "p50_ms": p50, "p95_ms": p95, "p99_ms": p99, "max_ms": ms.max()}
+    return stats
+
+def reset():
+    with _lock:
+        _timings.clear()
+
+def export_metrics(path: str = None):
+    path = path or METRICS_PATH
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    payload = {"timestamp": time.time(), "stages": summary()}
+    # File sementara unik: setiap proses menjalankan exporter-nya sendiri ke path yang sama
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(payload, f, indent=4, default=float)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def start_exporter(path: str = None, interval: float = EXPORT_INTERVAL):
+    """Jalankan thread latar yang menulis metrik ke file secara berkala (sekali per proses)."""
+    global _exporter
+    with _lock:
+        if _exporter is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(interval)
+                if ENABLED:
+                    export_metrics(path)
+
+        _exporter = threading.Thread(target=run, name="metrics-exporter", daemon=True)
+        _exporter.start()
@@ -0,0 +1,130 @@
+# utils/user_store.py
+import json
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+class JsonUserStore:
+    """Backend lama: seluruh user di satu file JSON (email -> hash password)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "w") as f:
+                json.dump({}, f)
+            return {}
+        with open(self.path, "r") as f:
+            return json.load(f)
+
+    def _save(self, users):
+        with open(self.path, "w") as f:
+            json.dump(users, f, indent=4)
+
+    def get(self, email: str):
+        return self._load().get(email)
+
+    def add(self, email: str, password_hash: str) -> bool:
+        with self._lock:
+            users = self._load()
+            if email in users:
+                return False
+            users[email] = password_hash
+            self._save(users)
+            return True
+
+    def update(self, email: str, password_hash: str) -> bool:
+        with self._lock:
+            users = self._load()
+            if email not in users:
+                return False
+            users[email] = password_hash
+            self._save(users)
+            return True
+
+    def upsert(self, email: str, password_hash: str):
+        with self._lock:
+            users = self._load()
+            users[email] = password_hash
+            self._save(users)
+
+class SqliteUserStore:
+    """Backend SQLite: email sebagai primary key, mode WAL, koneksi di-pool."""
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, path: str, migrate_from: str = None, pool_size: int = 4):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._pool = queue.Queue(maxsize=pool_size)
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS users ("
+                "email TEXT PRIMARY KEY, password_hash TEXT NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            if conn.execute("PRAGMA user_version").fetchone()[0] < self.SCHEMA_VERSION:
+                self._migrate(conn, migrate_from)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def _migrate(self, conn, json_path):
+        # Migrasi sekali jalan dari users.json; ditandai lewat PRAGMA user_version
+        users = {}
+        if json_path and os.path.exists(json_path):
+            with open(json_path, "r") as f:
+                users = json.load(f)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("INSERT OR IGNORE INTO users VALUES (?, ?)", users.items())
+            conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get(self, email: str):
+        with self._connection() as conn:
+            row = conn.execute("SELECT password_hash FROM users WHERE email = ?", (email,)).fetchone()
+        return row[0] if row else None
+
+    def add(self, email: str, password_hash: str) -> bool:
+        with self._connection() as conn:
+            cur = conn.execute("INSERT OR IGNORE INTO users VALUES (?, ?)", (email, password_hash))
+        return cur.rowcount == 1
+
+    def update(self, email: str, password_hash: str) -> bool:
+        with self._connection() as conn:
+            cur = conn.execute("UPDATE users SET password_hash = ? WHERE email = ?", (password_hash, email))
+        return cur.rowcount == 1
+
+    def upsert(self, email: str, password_hash: str):
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT INTO users VALUES (?, ?) "
+                "ON CONFLICT(email) DO UPDATE SET password_hash = excluded.password_hash",
+                (email, password_hash),
+            )
+
+    def close(self):
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
@@ -1,10 +1,80 @@
 # visualizer.py
 
-import matplotlib.pyplot as plt
-import seaborn as sns
+import io
+from functools import lru_cache
+
+import matplotlib
+from matplotlib.artist import setp
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import streamlit as st
 import pandas as pd
 import numpy as np
 
+from config import SKILL_LIST
+from utils.tracing import traced
+
+FEATURE_NAMES = ["Minat", "Ekskul"] + SKILL_LIST + ["Kontribusi", "Prestasi", "Jml Klub"]
+CHART_CACHE_SIZE = 256
+
+def _new_figure(figsize) -> Figure:
+    # Figure + canvas Agg langsung, bukan pyplot: pengelola figure global pyplot tidak thread-safe,
+    # sedangkan Streamlit merender sesi di thread berbeda. Figure dilepas GC, tanpa plt.close.
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+def _figure_to_png(fig) -> bytes:
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", bbox_inches="tight")
+    return buf.getvalue()
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def _render_score_bar(majors: tuple, scores: tuple) -> bytes:
+    fig = _new_figure((6, 4))
+    ax = fig.subplots()
+    colors = matplotlib.colormaps["viridis"](np.linspace(0, 1, len(scores)))
+    ax.bar(majors, scores, color=colors)
+    ax.set_ylim(0, 1.1)
+    ax.set_ylabel("Skor Kesesuaian")
+    setp(ax.get_xticklabels(), rotation=45, ha="right")
+    return _figure_to_png(fig)
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def _render_competency_radar(profile_vector: tuple, centroid: tuple) -> bytes:
+    N = len(FEATURE_NAMES)
+    angles = np.linspace(0, 2 * np.pi, N, endpoint=False).tolist()
+    angles += angles[:1]
+    fig = _new_figure((6, 6))
+    ax = fig.subplots(subplot_kw=dict(polar=True))
+    # Profil Anda
+    vals_std = list(profile_vector)
+    vals_std += vals_std[:1]
+    ax.plot(angles, vals_std, 'o-', linewidth=2, label='Anda')
+    ax.fill(angles, vals_std, alpha=0.25)
+    # Rata-rata Cluster
+    vals_ideal = list(centroid)
+    vals_ideal += vals_ideal[:1]
+    ax.plot(angles, vals_ideal, 'o--', linewidth=2, label='Rata-rata Cluster')
+    ax.fill(angles, vals_ideal, alpha=0.1)
+    ax.set_thetagrids(np.degrees(angles[:-1]), FEATURE_NAMES)
+    ax.legend(loc='upper right', bbox_to_anchor=(0.1, 0.1))
+    ax.set_title("Perbandingan Profil Kompetensi", pad=20)
+    return _figure_to_png(fig)
+
+@traced("visualizer.render_score_bar")
+def render_score_bar(majors, scores) -> bytes:
+    """PNG bar chart skor rekomendasi (di-cache per kombinasi jurusan & skor)."""
+    return _render_score_bar(tuple(majors), tuple(float(s) for s in scores))
+
+@traced("visualizer.render_competency_radar")
+def render_competency_radar(profile_vector, centroid) -> bytes:
+    """PNG radar chart profil siswa vs centroid cluster (di-cache per vektor)."""
+    return _render_competency_radar(
+        tuple(float(v) for v in profile_vector),
+        tuple(float(v) for v in centroid),
+    )
+
 def plot_cluster_summary(result_df: pd.DataFrame, k: int):
     """Plot ringkasan data dan status proses."""
     st.subheader("Ringkasan Data")
@@ -12,7 +82,7 @@ def plot_cluster_summary(result_df: pd.DataFrame, k: int):
     col1.metric("Jumlah Siswa", len(result_df))
     col2.metric("Jumlah Fitur", len([col for col in result_df.columns if col != 'ClusterID']))
     col3.metric("Jumlah Cluster", k)
-    
+
     st.subheader("Status Proses")
     st.progress(100, text=f"Selesai. {k} Cluster terbentuk.")
 
@@ -21,48 +91,19 @@ def plot_decision_matrix(df_scaled: pd.DataFrame):
     st.subheader("Matriks Keputusan (Data Terstandarisasi)")
     st.dataframe(df_scaled, use_container_width=True)
 
-def plot_recommendation_ranking(cluster_id: int, majors: dict, scores: list):
+def plot_recommendation_ranking(majors: list, scores: list):
     """Plot ranking rekomendasi jurusan."""
-    st.subheader("Ranking Rekomendasi")
-    for i, (major, score) in enumerate(zip(majors[cluster_id], scores), 1):
-        st.markdown(f"**{i}. {major}** <span style='float:right;'>{score:.2f}</span>", unsafe_allow_html=True)
+    with st.container(border=True):
+        st.markdown("### 🔢 Ranking Rekomendasi")
+        for i, (m, s) in enumerate(zip(majors, scores), 1):
+            st.markdown(f"**{i}. {m}** — Skor: **{s:.2f}**")
 
 def plot_recommendation_score_bar(scores: list, majors_list: list):
     """Plot bar chart skor rekomendasi."""
-    st.subheader("Skor Rekomendasi")
-    fig, ax = plt.subplots(figsize=(6, 4))
-    bar_colors = ['blue', 'green', 'red', 'purple']
-    ax.bar(range(len(scores)), scores, color=bar_colors[:len(scores)])
-    ax.set_xticks(range(len(scores)))
-    ax.set_xticklabels(majors_list, rotation=45, ha='right')
-    ax.set_ylim(0, 1.2)
-    ax.set_title("Skor Rekomendasi per Jurusan")
-    st.pyplot(fig)
-
-def plot_competency_profile(features: list, cluster_mean: list):
+    st.markdown("### 📊 Skor Rekomendasi")
+    st.image(render_score_bar(majors_list, scores))
+
+def plot_competency_profile(features, cluster_mean):
     """Plot radar chart profil kompetensi."""
-    st.subheader("Profil Kompetensi")
-    categories = ['Minat', 'Ekskul', 'Skill1', 'Skill2', 'Skill3', 'Skill4', 'Skill5', 'Skill6', 'Kontribusi', 'Prestasi', 'Jml Klub']
-    N = len(categories)
-    
-    angles = np.linspace(0, 2 * np.pi, N, endpoint=False).tolist()
-    angles += angles[:1]
-    
-    fig, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(polar=True))
-    
-    # Plot profil siswa
-    values = features.tolist()
-    values += values[:1]
-    ax.plot(angles, values, 'o-', linewidth=2, label='Anda')
-    ax.fill(angles, values, alpha=0.25)
-    
-    # Plot profil ideal cluster
-    values_ideal = cluster_mean.tolist()
-    values_ideal += values_ideal[:1]
-    ax.plot(angles, values_ideal, 'o--', linewidth=2, label='Ideal Cluster')
-    ax.fill(angles, values_ideal, alpha=0.1)
-    
-    ax.set_thetagrids(np.degrees(angles[:-1]), categories)
-    ax.legend(loc='upper right', bbox_to_anchor=(0.1, 0.1))
-    ax.set_title("Perbandingan Profil Kompetensi")
-    st.pyplot(fig)
\ No newline at end of file
+    st.markdown("### 📈 Profil Kompetensi Anda")
+    st.image(render_competency_radar(features, cluster_mean))